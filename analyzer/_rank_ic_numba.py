@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+基于Numba的每日Rank IC计算内核
+
+该模块依赖numba，仅在FACTOR_ANALYSIS_CONFIG['USE_NUMBA']开启时由因子分析器导入。
+"""
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(cache=True)
+def _rank(x):
+    """
+    计算一维数组的秩（从1开始，并列值取平均秩），同时返回是否存在并列值
+    """
+    n = len(x)
+    order = np.argsort(x)
+    ranks = np.empty(n, dtype=np.float64)
+    has_ties = False
+    i = 0
+    while i < n:
+        j = i
+        while j + 1 < n and x[order[j + 1]] == x[order[i]]:
+            j += 1
+        if j > i:
+            has_ties = True
+        avg_rank = (i + j) / 2.0 + 1.0
+        for k in range(i, j + 1):
+            ranks[order[k]] = avg_rank
+        i = j + 1
+    return ranks, has_ties
+
+
+@njit(cache=True)
+def _pearson(a, b):
+    """
+    计算两个等长数组的皮尔逊相关系数，方差为0时返回NaN
+    """
+    n = len(a)
+    mean_a = a.sum() / n
+    mean_b = b.sum() / n
+    cov = 0.0
+    var_a = 0.0
+    var_b = 0.0
+    for i in range(n):
+        da = a[i] - mean_a
+        db = b[i] - mean_b
+        cov += da * db
+        var_a += da * da
+        var_b += db * db
+    if var_a == 0.0 or var_b == 0.0:
+        return np.nan
+    return cov / np.sqrt(var_a * var_b)
+
+
+@njit(cache=True)
+def _spearman(a, b):
+    """
+    计算Spearman秩相关系数，无并列值时使用闭式公式1-6Σd²/(n(n²-1))，否则计算秩的皮尔逊相关系数
+    """
+    rank_a, ties_a = _rank(a)
+    rank_b, ties_b = _rank(b)
+    if ties_a or ties_b:
+        return _pearson(rank_a, rank_b)
+    n = len(a)
+    d = rank_a - rank_b
+    return 1.0 - 6.0 * (d * d).sum() / (n * (n * n - 1.0))
+
+
+@njit(parallel=True, cache=True)
+def daily_spearman(offsets, factor, ret, out):
+    """
+    按交易日并行计算Spearman秩相关系数
+
+    参数:
+        offsets: 每个交易日在数组中的起始位置，长度为交易日数+1
+        factor: 按交易日排序的因子值
+        ret: 与factor对齐的收益率
+        out: 输出数组，长度为交易日数
+    """
+    for d in prange(len(offsets) - 1):
+        start = offsets[d]
+        end = offsets[d + 1]
+        if end - start < 2:
+            out[d] = np.nan
+            continue
+        out[d] = _spearman(factor[start:end], ret[start:end])
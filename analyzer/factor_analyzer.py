@@ -9,8 +9,8 @@
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from config.config import FACTOR_ANALYSIS_CONFIG, get_full_path
-from config.logger_config import factor_analysis_logger
+from config.config import FACTOR_ANALYSIS_CONFIG, BASE_DIRS, get_full_path, get_run_timestamp, set_run_timestamp
+from config.logger_config import factor_analysis_logger, start_queue_listener, stop_queue_listener, use_queue_handler
 
 # 从配置文件获取配置
 TEST_SCOPE = FACTOR_ANALYSIS_CONFIG['TEST_SCOPE']
@@ -20,6 +20,13 @@ END_DATE = FACTOR_ANALYSIS_CONFIG['END_DATE']
 FORWARD_PERIOD = FACTOR_ANALYSIS_CONFIG['FORWARD_PERIOD']
 NORMALIZE_FACTOR = FACTOR_ANALYSIS_CONFIG['NORMALIZE_FACTOR']
 GROUP_NUM = FACTOR_ANALYSIS_CONFIG['GROUP_NUM']
+USE_POLARS = FACTOR_ANALYSIS_CONFIG['USE_POLARS']
+USE_NUMBA = FACTOR_ANALYSIS_CONFIG['USE_NUMBA']
+FIGURE_DPI = FACTOR_ANALYSIS_CONFIG['FIGURE_DPI']
+USE_PARQUET_CACHE = FACTOR_ANALYSIS_CONFIG['USE_PARQUET_CACHE']
+MAX_WORKERS = FACTOR_ANALYSIS_CONFIG['MAX_WORKERS']
+SAVE_SUMMARY_CSV = FACTOR_ANALYSIS_CONFIG['SAVE_SUMMARY_CSV']
+CACHE_GROUP_RETURNS = FACTOR_ANALYSIS_CONFIG['CACHE_GROUP_RETURNS']
 RESULT_DIR = FACTOR_ANALYSIS_CONFIG['RESULT_DIR']
 REPORT_DIR = FACTOR_ANALYSIS_CONFIG['REPORT_DIR']
 
@@ -33,14 +40,52 @@ import numpy as np
 import os
 import sys
 import logging
+import io
+import json
+import hashlib
+import pickle
+import sqlite3
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
 import matplotlib.pyplot as plt
 import seaborn as sns
-from scipy.stats import spearmanr
+from scipy import stats
 from datetime import datetime
-import warnings
 
-# 抑制特定的FutureWarning
-warnings.filterwarnings('ignore', message='DataFrameGroupBy.apply operated on the grouping columns')
+# Polars为可选依赖，仅在USE_POLARS开启时使用
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+# PyArrow为可选依赖，仅在USE_PARQUET_CACHE开启时使用
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    feather = None
+    pq = None
+
+# Parquet缓存的表结构，只缓存分析需要的列
+PARQUET_CACHE_SCHEMAS = {
+    'factors': ['ts_code', 'trade_date', 'factor_name', 'factor_value'],
+    'daily_quotes': ['ts_code', 'trade_date', 'close'],
+}
+
+# orjson为可选依赖，用于加速分析报告的JSON序列化，未安装时使用标准库json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Numba内核为可选依赖，仅在USE_NUMBA开启时使用
+try:
+    from analyzer._rank_ic_numba import daily_spearman
+except ImportError:
+    daily_spearman = None
 
 # 设置pandas参数以抑制FutureWarning
 pd.options.mode.chained_assignment = None  # 关闭链式赋值警告
@@ -78,6 +123,51 @@ from factor_lib.utils import get_database_connection, load_stock_data
 # 日志记录器已从config.logger_config导入
 
 
+def parse_trade_dates(dates):
+    """
+    将交易日期字符串解析为日期类型
+    同一交易日在所有股票中重复出现，只解析去重后的日期，再按编码展开到每一行
+    
+    参数:
+        dates: 交易日期字符串Series
+        
+    返回:
+        pandas.Series: datetime64类型的交易日期，缺失值为NaT
+    """
+    codes, uniques = pd.factorize(dates)
+    parsed = pd.to_datetime(uniques).take(codes, allow_fill=True, fill_value=pd.NaT)
+    return pd.Series(parsed, index=dates.index, name=dates.name)
+
+
+def group_standardize(values, codes, n_groups):
+    """
+    按整数分组编码对数值做组内标准化（减均值除以样本标准差）
+    通过np.bincount一次性求出各组的和与离差平方和，避免groupby的哈希分组和多次广播
+    
+    参数:
+        values: 待标准化的float64数组，可包含NaN
+        codes: 与values对齐的分组编码（0到n_groups-1，-1表示缺失）
+        n_groups: 分组数量
+        
+    返回:
+        numpy.ndarray: 标准化后的数组，标准差为0或无法计算的组只做去均值处理
+    """
+    valid = (codes >= 0) & ~np.isnan(values)
+    valid_codes = codes[valid]
+    
+    count = np.bincount(valid_codes, minlength=n_groups)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = np.bincount(valid_codes, weights=values[valid], minlength=n_groups) / count
+        
+        deviation = values - mean[codes]
+        deviation[codes < 0] = np.nan
+        sum_sq = np.bincount(valid_codes, weights=deviation[valid] ** 2, minlength=n_groups)
+        std = np.sqrt(sum_sq / (count - 1))
+    
+    scale = np.where(std > 0, std, 1.0)
+    return deviation / scale[codes]
+
+
 class FactorAnalyzer:
     """
     因子分析器类，用于计算因子的Rank IC和IR
@@ -94,8 +184,38 @@ class FactorAnalyzer:
         self.stock_data = None
         self.factor_data = None
         self.return_data = None
+        self._indexed_return_data = None
+        self._return_data_key = None
+        self._preloaded_factor_data = {}
+        self._preloaded_factor_key = None
+        self._last_factor_data = None  # 最近一次加载并标准化的因子数据：(参数, 数据)
         self.test_scope = 'ALL_A'
         self.individual_stock = None
+        self._stocks_cache = None
+        self._stock_dtype = None
+        self._fig = None
+        
+        # 图表目录只需创建一次，本次运行的所有图表（包括并行工作进程中生成的）使用同一时间戳
+        self.figure_dir = os.path.join('report', 'figures')
+        os.makedirs(self.figure_dir, exist_ok=True)
+        self._run_stamp = get_run_timestamp()
+        
+    def _get_figure(self, figsize):
+        """
+        获取复用的绘图画布，清空后按指定尺寸返回新的坐标轴
+        
+        参数:
+            figsize: 图表尺寸
+            
+        返回:
+            tuple: (figure, axes)
+        """
+        if self._fig is None:
+            self._fig = plt.figure(figsize=figsize)
+        else:
+            self._fig.clear()
+            self._fig.set_size_inches(figsize)
+        return self._fig, self._fig.add_subplot(111)
         
     def set_test_scope(self, test_scope, individual_stock=None):
         """
@@ -106,6 +226,13 @@ class FactorAnalyzer:
             individual_stock: 单个股票代码（仅当test_scope为INDIVIDUAL时需要）
         """
         self.test_scope = test_scope
+        # 测试范围变化后，已缓存的股票列表、因子和收益率数据均失效
+        self._stocks_cache = None
+        self._stock_dtype = None
+        self._return_data_key = None
+        self._preloaded_factor_data = {}
+        self._preloaded_factor_key = None
+        self._last_factor_data = None
         if test_scope == 'INDIVIDUAL':
             if not individual_stock:
                 raise ValueError("当test_scope为INDIVIDUAL时，必须指定individual_stock参数")
@@ -120,6 +247,8 @@ class FactorAnalyzer:
     def get_test_stocks(self):
         """
         获取测试范围内的股票列表
+        结果在分析器实例内缓存（set_test_scope时失效），并按测试范围缓存到磁盘，
+        数据库文件更新后磁盘缓存自动失效
         
         返回:
             list: 股票代码列表
@@ -128,12 +257,31 @@ class FactorAnalyzer:
             if self.test_scope == 'INDIVIDUAL':
                 return [self.individual_stock]
             
+            if self._stocks_cache is not None:
+                return self._stocks_cache
+            
+            # 优先读取磁盘缓存
+            cache_path, db_mtime = self._get_stocks_cache_info()
+            if cache_path and os.path.exists(cache_path):
+                with open(cache_path, 'rb') as f:
+                    cached = pickle.load(f)
+                if cached.get('db_mtime') == db_mtime:
+                    self._stocks_cache = cached['stocks']
+                    logger.info(f"从缓存获取到 {len(self._stocks_cache)} 只股票")
+                    return self._stocks_cache
+            
             # 直接从daily_quotes表获取所有唯一股票代码
             # 目前数据库中没有指数成分股表，所以不管选择什么测试范围，都返回所有股票
             query = "SELECT DISTINCT ts_code FROM daily_quotes"
             df = pd.read_sql_query(query, self.conn)
             stocks_list = df['ts_code'].tolist()
             
+            self._stocks_cache = stocks_list
+            if cache_path:
+                os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                with open(cache_path, 'wb') as f:
+                    pickle.dump({'db_mtime': db_mtime, 'stocks': stocks_list}, f)
+            
             logger.info(f"获取到 {len(stocks_list)} 只股票")
             return stocks_list
         except Exception as e:
@@ -141,6 +289,109 @@ class FactorAnalyzer:
             logger.info("默认返回空列表")
             return []
         
+    def _get_stocks_cache_info(self):
+        """
+        获取股票列表磁盘缓存的路径和数据库文件的修改时间
+        
+        返回:
+            tuple: (缓存文件路径, 数据库修改时间)，内存数据库等无法缓存时返回(None, None)
+        """
+        db_file = self.conn.execute("PRAGMA database_list").fetchone()[2]
+        if not db_file or not os.path.exists(db_file):
+            return None, None
+        cache_path = os.path.join(BASE_DIRS['TEMP'], 'cache', f'test_stocks_{self.test_scope}.pkl')
+        return cache_path, os.path.getmtime(db_file)
+    
+    def _to_stock_category(self, data):
+        """
+        将ts_code转换为以测试范围股票列表为类别的分类类型，
+        因子数据和收益率数据共享同一类型，合并和分组时直接比较整数编码
+        
+        参数:
+            data: 包含ts_code列的数据
+            
+        返回:
+            pandas.DataFrame: 转换后的数据
+        """
+        if self._stock_dtype is None:
+            test_stocks = self.get_test_stocks()
+            if not test_stocks:
+                return data
+            self._stock_dtype = pd.CategoricalDtype(categories=sorted(set(test_stocks)))
+        data['ts_code'] = data['ts_code'].astype(self._stock_dtype)
+        return data
+    
+    def _ensure_parquet_cache(self, table):
+        """
+        确保数据表的Parquet缓存存在且与当前数据库文件一致，否则从数据库重新导出
+        缓存文件名包含数据库路径的哈希，文件元数据记录导出时数据库的修改时间，两者都一致时才使用缓存
+        
+        参数:
+            table: 表名（factors或daily_quotes）
+            
+        返回:
+            str: 缓存文件路径，未开启缓存、未安装pyarrow或内存数据库时返回None
+        """
+        if not USE_PARQUET_CACHE or pq is None:
+            return None
+        
+        db_file = self.conn.execute("PRAGMA database_list").fetchone()[2]
+        if not db_file or not os.path.exists(db_file):
+            return None
+        
+        db_hash = hashlib.md5(os.path.abspath(db_file).encode('utf-8')).hexdigest()
+        cache_path = os.path.join(BASE_DIRS['TEMP'], 'cache', f'{table}_{db_hash}.parquet')
+        # 导出前记录修改时间，导出期间数据库被修改时下次调用会重新导出
+        db_mtime = repr(os.path.getmtime(db_file)).encode('utf-8')
+        if os.path.exists(cache_path):
+            metadata = pq.read_schema(cache_path).metadata or {}
+            if metadata.get(b'db_mtime') == db_mtime:
+                return cache_path
+        
+        logger.info(f"正在导出 {table} 表的Parquet缓存: {cache_path}")
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        columns = PARQUET_CACHE_SCHEMAS[table]
+        schema = pa.schema([(col, pa.float64() if col in ('factor_value', 'close') else pa.string())
+                            for col in columns], metadata={b'db_mtime': db_mtime})
+        
+        # 分块写入，避免一次性将整张表读入内存
+        tmp_path = cache_path + '.tmp'
+        query = f"SELECT {', '.join(columns)} FROM {table}"
+        with pq.ParquetWriter(tmp_path, schema, compression='snappy') as writer:
+            for chunk in pd.read_sql_query(query, self.conn, chunksize=500000):
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+        os.replace(tmp_path, cache_path)
+        return cache_path
+    
+    def _read_parquet_cache(self, cache_path, columns, start_date=None, end_date=None, extra_filters=None):
+        """
+        按条件读取Parquet缓存，日期和股票范围通过谓词下推过滤
+        
+        参数:
+            cache_path: 缓存文件路径
+            columns: 需要读取的列
+            start_date: 开始日期
+            end_date: 结束日期
+            extra_filters: 其他过滤条件列表
+            
+        返回:
+            pandas.DataFrame: 过滤后的数据，trade_date已解析为日期类型
+        """
+        filters = list(extra_filters or [])
+        if start_date:
+            filters.append(('trade_date', '>=', start_date))
+        if end_date:
+            filters.append(('trade_date', '<=', end_date))
+        
+        test_stocks = self.get_test_stocks()
+        if test_stocks and len(test_stocks) > 0:
+            filters.append(('ts_code', 'in', test_stocks))
+        
+        table = pq.read_table(cache_path, columns=columns, filters=filters or None)
+        data = table.to_pandas()
+        data['trade_date'] = parse_trade_dates(data['trade_date'])
+        return data
+    
     def load_factor_data(self, factor_name, start_date=None, end_date=None, normalize=True):
         """
         加载因子数据（优化版）
@@ -149,51 +400,31 @@ class FactorAnalyzer:
             factor_name: 因子名称
             start_date: 开始日期
             end_date: 结束日期
-            normalize: 是否进行横截面标准化
+            normalize: 是否进行横截面标准化（逐日单调变换，不影响基于每日排序的Rank IC和分组收益）
         """
         try:
-            # 使用参数化查询提高安全性和性能
-            query = "SELECT ts_code, trade_date, factor_value FROM factors WHERE factor_name = ?"
-            params = [factor_name]
-            
-            # 构建条件列表
-            conditions = []
-            if start_date:
-                conditions.append("trade_date >= ?")
-                params.append(start_date)
-            if end_date:
-                conditions.append("trade_date <= ?")
-                params.append(end_date)
-            
-            # 添加测试范围过滤
-            test_stocks = self.get_test_stocks()
-            if test_stocks and len(test_stocks) > 0:
-                if len(test_stocks) == 1:
-                    conditions.append("ts_code = ?")
-                    params.append(test_stocks[0])
-                else:
-                    # 使用参数化的IN查询
-                    placeholders = ",".join(["?"] * len(test_stocks))
-                    conditions.append(f"ts_code IN ({placeholders})")
-                    params.extend(test_stocks)
-            
-            if conditions:
-                query += " AND " + " AND ".join(conditions)
-            
-            # 加载因子数据，使用chunked读取提高大查询性能
-            chunks = []
-            for chunk in pd.read_sql_query(query, self.conn, params=params, chunksize=100000):
-                chunks.append(chunk)
-            
-            if chunks:
-                self.factor_data = pd.concat(chunks, ignore_index=True)
-            else:
-                self.factor_data = pd.DataFrame()
+            # Rank IC分析和分组收益分析先后加载同一因子，直接复用上一次标准化后的结果
+            load_key = (factor_name, start_date, end_date, normalize)
+            if self._last_factor_data is not None and self._last_factor_data[0] == load_key:
+                self.factor_data = self._last_factor_data[1].copy()
+                logger.info(f"复用已加载的因子 {factor_name} 数据: {len(self.factor_data)} 条")
                 return True
             
-            # 转换日期类型并排序
-            self.factor_data['trade_date'] = pd.to_datetime(self.factor_data['trade_date'])
-            self.factor_data = self.factor_data.sort_values(['trade_date', 'ts_code'])  # 按日期优先排序，便于后续按日期分组处理
+            if self._preloaded_factor_key is not None and \
+                    factor_name in self._preloaded_factor_key[0] and \
+                    self._preloaded_factor_key[1:] == (start_date, end_date):
+                # 使用批量预加载的数据，复制一份以免标准化修改缓存
+                preloaded = self._preloaded_factor_data.get(factor_name)
+                if preloaded is None:
+                    # 与数据库查询无结果时一致，返回带有标准列的空数据
+                    self.factor_data = pd.DataFrame(columns=['ts_code', 'trade_date', 'factor_value'])
+                    return True
+                self.factor_data = preloaded.copy()
+            else:
+                self.factor_data = self._query_factor_data([factor_name], start_date, end_date)
+                if self.factor_data.empty:
+                    return True
+                self.factor_data = self.factor_data.drop(columns='factor_name')
             
             # 单因子标准化（时间序列标准化）
             self.time_series_normalize()
@@ -205,11 +436,106 @@ class FactorAnalyzer:
                 logger.info(f"因子 {factor_name} 数据已进行横截面标准化")
             
             logger.info(f"成功加载因子 {factor_name} 数据: {len(self.factor_data)} 条")
+            # 缓存保存标准化结果，调用方拿到的是副本，修改不会影响缓存
+            self._last_factor_data = (load_key, self.factor_data)
+            self.factor_data = self.factor_data.copy()
             return True
         except Exception as e:
             logger.error(f"加载因子数据失败: {str(e)}")
             return False
     
+    def preload_factor_data(self, factor_names, start_date=None, end_date=None):
+        """
+        一次查询批量加载多个因子的原始数据，之后相同日期范围的load_factor_data直接复用
+        
+        参数:
+            factor_names: 因子名称列表
+            start_date: 开始日期
+            end_date: 结束日期
+            
+        返回:
+            bool: 是否加载成功
+        """
+        try:
+            all_factor_data = self._query_factor_data(factor_names, start_date, end_date)
+            
+            self._last_factor_data = None
+            self._preloaded_factor_data = {}
+            if not all_factor_data.empty:
+                for factor_name, factor_data in all_factor_data.groupby('factor_name', sort=False):
+                    self._preloaded_factor_data[factor_name] = factor_data.drop(columns='factor_name').reset_index(drop=True)
+            self._preloaded_factor_key = (frozenset(factor_names), start_date, end_date)
+            
+            logger.info(f"批量加载 {len(self._preloaded_factor_data)} 个因子数据: {len(all_factor_data)} 条")
+            return True
+        except Exception as e:
+            logger.error(f"批量加载因子数据失败: {str(e)}")
+            self._preloaded_factor_data = {}
+            self._preloaded_factor_key = None
+            return False
+    
+    def _query_factor_data(self, factor_names, start_date=None, end_date=None):
+        """
+        从factors表查询指定因子在测试范围内的数据
+        
+        参数:
+            factor_names: 因子名称列表
+            start_date: 开始日期
+            end_date: 结束日期
+            
+        返回:
+            pandas.DataFrame: 包含ts_code、trade_date、factor_name、factor_value列，按日期、股票排序
+        """
+        cache_path = self._ensure_parquet_cache('factors')
+        if cache_path:
+            data = self._read_parquet_cache(cache_path, PARQUET_CACHE_SCHEMAS['factors'], start_date, end_date,
+                                            [('factor_name', 'in', list(factor_names))])
+            data = data.sort_values(['trade_date', 'ts_code'], kind='stable').reset_index(drop=True)
+            return self._to_stock_category(data)
+        
+        # 使用参数化查询提高安全性和性能
+        placeholders = ",".join(["?"] * len(factor_names))
+        query = f"SELECT ts_code, trade_date, factor_name, factor_value FROM factors WHERE factor_name IN ({placeholders})"
+        params = list(factor_names)
+        
+        # 构建条件列表
+        conditions = []
+        if start_date:
+            conditions.append("trade_date >= ?")
+            params.append(start_date)
+        if end_date:
+            conditions.append("trade_date <= ?")
+            params.append(end_date)
+        
+        # 添加测试范围过滤
+        test_stocks = self.get_test_stocks()
+        if test_stocks and len(test_stocks) > 0:
+            if len(test_stocks) == 1:
+                conditions.append("ts_code = ?")
+                params.append(test_stocks[0])
+            else:
+                # 使用参数化的IN查询
+                placeholders = ",".join(["?"] * len(test_stocks))
+                conditions.append(f"ts_code IN ({placeholders})")
+                params.extend(test_stocks)
+        
+        if conditions:
+            query += " AND " + " AND ".join(conditions)
+        
+        # 按日期优先排序，便于后续按日期分组处理
+        query += " ORDER BY trade_date, ts_code"
+        
+        # 使用chunked读取提高大查询性能，合并后对去重的日期统一解析
+        chunks = []
+        for chunk in pd.read_sql_query(query, self.conn, params=params, chunksize=100000):
+            chunks.append(chunk)
+        
+        if not chunks:
+            return pd.DataFrame()
+        data = pd.concat(chunks, ignore_index=True)
+        data['trade_date'] = parse_trade_dates(data['trade_date'])
+        return self._to_stock_category(data)
+    
     def time_series_normalize(self):
         """
         对因子数据进行时间序列标准化（单因子标准化）
@@ -221,10 +547,15 @@ class FactorAnalyzer:
             return
         
         try:
-            # 使用向量化操作进行时间序列标准化
-            self.factor_data['factor_value'] = self.factor_data.groupby('ts_code')['factor_value'].transform(
-                lambda x: (x - x.mean()) / (x.std() if x.std() > 0 else 1)
-            )
+            # ts_code为分类类型时直接使用其整数编码分组
+            ts_code = self.factor_data['ts_code']
+            if isinstance(ts_code.dtype, pd.CategoricalDtype):
+                codes, n_groups = ts_code.cat.codes.to_numpy(), len(ts_code.cat.categories)
+            else:
+                codes, uniques = pd.factorize(ts_code)
+                n_groups = len(uniques)
+            self.factor_data['factor_value'] = group_standardize(
+                self.factor_data['factor_value'].to_numpy(dtype=np.float64), codes, n_groups)
             
             logger.info("因子数据时间序列标准化完成")
         except Exception as e:
@@ -240,19 +571,34 @@ class FactorAnalyzer:
             return
         
         try:
-            # 使用向量化操作进行横截面标准化
-            self.factor_data['factor_value'] = self.factor_data.groupby('trade_date')['factor_value'].transform(
-                lambda x: (x - x.mean()) / (x.std() if x.std() > 0 else 1)
-            )
+            codes, uniques = pd.factorize(self.factor_data['trade_date'])
+            self.factor_data['factor_value'] = group_standardize(
+                self.factor_data['factor_value'].to_numpy(dtype=np.float64), codes, len(uniques))
             
             logger.info("因子数据横截面标准化完成")
         except Exception as e:
             logger.error(f"因子数据标准化失败: {str(e)}")
     
+    @staticmethod
+    def get_return_end_date(end_date, forward_period):
+        """
+        获取收益率数据的结束日期：远期收益率需要forward_period天的后续数据，结束日期相应后移
+        
+        参数:
+            end_date: 因子数据的结束日期
+            forward_period: 向前预测的周期数
+            
+        返回:
+            str: 收益率数据的结束日期，未指定end_date时返回None
+        """
+        if not end_date:
+            return None
+        return (pd.to_datetime(end_date) + pd.Timedelta(days=forward_period)).strftime('%Y-%m-%d')
+    
     def load_return_data(self, start_date=None, end_date=None, forward_period=1):
         """
         加载收益率数据
-        优化：使用参数化查询，批量处理，减少内存使用
+        优化：使用参数化查询，在数据库中用窗口函数计算远期收益率，减少传输的数据量
         
         参数:
             start_date: 开始日期
@@ -260,9 +606,24 @@ class FactorAnalyzer:
             forward_period: 向前预测的周期数
         """
         try:
-            # 使用参数化查询加载原始价格数据
-            query = "SELECT ts_code, trade_date, close FROM daily_quotes"
-            params = []
+            # 相同参数的收益率数据已加载时直接复用
+            return_data_key = (start_date, end_date, forward_period)
+            if self._return_data_key == return_data_key and self.return_data is not None:
+                logger.info(f"复用已加载的收益率数据: {len(self.return_data)} 条")
+                return True
+            
+            cache_path = self._ensure_parquet_cache('daily_quotes')
+            if cache_path:
+                return self._load_return_data_from_parquet(cache_path, start_date, end_date, forward_period)
+            
+            # 使用参数化查询，并通过LEAD窗口函数在数据库中计算远期收益率
+            query = (
+                "SELECT ts_code, trade_date, "
+                "(LEAD(close, ?) OVER (PARTITION BY ts_code ORDER BY trade_date) - close) "
+                "/ CAST(close AS REAL) AS \"return\" "
+                "FROM daily_quotes"
+            )
+            params = [forward_period]
             conditions = []
             
             if start_date:
@@ -286,30 +647,27 @@ class FactorAnalyzer:
             if conditions:
                 query += " WHERE " + " AND ".join(conditions)
             
-            # 使用chunked读取减少内存占用
+            # 移除最后forward_period天（无远期价格）的数据
+            query = f"SELECT ts_code, trade_date, \"return\" FROM ({query}) WHERE \"return\" IS NOT NULL ORDER BY trade_date, ts_code"
+            
+            # 使用chunked读取减少内存占用，合并后对去重的日期统一解析
+            # 收益率在读取时直接落为float32，精度足够且内存减半
             chunks = []
-            for chunk in pd.read_sql_query(query, self.conn, params=params, chunksize=100000):
+            for chunk in pd.read_sql_query(query, self.conn, params=params, chunksize=100000,
+                                           dtype={'return': 'float32'}):
                 chunks.append(chunk)
             
+            # 收益率数据已变化，需重建按索引对齐的副本
+            self._indexed_return_data = None
+            
             if not chunks:
                 self.return_data = pd.DataFrame()
                 return True
             
-            price_data = pd.concat(chunks, ignore_index=True)
-            price_data['trade_date'] = pd.to_datetime(price_data['trade_date'])
-            price_data = price_data.sort_values(['ts_code', 'trade_date'])
-            
-            # 计算收益率
-            price_data['next_close'] = price_data.groupby('ts_code')['close'].shift(-forward_period)
-            price_data['return'] = (price_data['next_close'] - price_data['close']) / price_data['close']
-            
-            # 移除最后forward_period天的数据
-            price_data = price_data.dropna(subset=['return'])
-            
-            self.return_data = price_data[['ts_code', 'trade_date', 'return']]
-            
-            # 释放内存
-            del price_data
+            self.return_data = pd.concat(chunks, ignore_index=True)
+            self.return_data['trade_date'] = parse_trade_dates(self.return_data['trade_date'])
+            self.return_data = self._to_stock_category(self.return_data)
+            self._return_data_key = return_data_key
             
             logger.info(f"成功加载收益率数据: {len(self.return_data)} 条")
             return True
@@ -317,12 +675,63 @@ class FactorAnalyzer:
             logger.error(f"加载收益率数据失败: {str(e)}")
             return False
     
-    def calculate_rank_ic(self):
+    def _load_return_data_from_parquet(self, cache_path, start_date, end_date, forward_period):
+        """
+        从Parquet缓存加载行情并计算远期收益率，结果与数据库窗口函数的计算一致
+        
+        参数:
+            cache_path: daily_quotes缓存文件路径
+            start_date: 开始日期
+            end_date: 结束日期
+            forward_period: 向前预测的周期数
+        """
+        quotes = self._read_parquet_cache(cache_path, PARQUET_CACHE_SCHEMAS['daily_quotes'], start_date, end_date)
+        quotes = quotes.sort_values(['ts_code', 'trade_date'], kind='stable')
+        
+        # 与LEAD(close, forward_period)等价：每只股票内向后平移forward_period行
+        future_close = quotes.groupby('ts_code', sort=False)['close'].shift(-forward_period)
+        quotes['return'] = ((future_close - quotes['close']) / quotes['close']).astype('float32')
+        
+        self._indexed_return_data = None
+        self.return_data = (
+            quotes.loc[quotes['return'].notna(), ['ts_code', 'trade_date', 'return']]
+            .sort_values(['trade_date', 'ts_code'], kind='stable')
+            .reset_index(drop=True)
+        )
+        if self.return_data.empty:
+            self.return_data = pd.DataFrame()
+            return True
+        self.return_data = self._to_stock_category(self.return_data)
+        self._return_data_key = (start_date, end_date, forward_period)
+        
+        logger.info(f"成功从Parquet缓存加载收益率数据: {len(self.return_data)} 条")
+        return True
+    
+    def _merge_factor_and_return(self):
+        """
+        按(trade_date, ts_code)索引对齐合并因子数据和收益率数据
+        两者均已按该顺序排序，索引连接可走有序合并；收益率的索引副本在多次合并间复用
+        缺失值不参与排序和分组，合并时直接剔除，各计算引擎保持一致
+        
+        返回:
+            pandas.DataFrame: 包含trade_date、ts_code、factor_value、return列的合并数据
+        """
+        if self._indexed_return_data is None:
+            self._indexed_return_data = self.return_data.set_index(['trade_date', 'ts_code'])[['return']]
+        
+        factor_data = self.factor_data.set_index(['trade_date', 'ts_code'])[['factor_value']]
+        merged_data = factor_data.join(self._indexed_return_data, how='inner').reset_index()
+        return merged_data.dropna(subset=['factor_value', 'return'])
+    
+    def calculate_rank_ic(self, with_p_value=False):
         """
         计算Rank IC
         
+        参数:
+            with_p_value: 是否同时计算每日Rank IC的显著性p值（t分布近似，一次向量化计算）
+        
         返回:
-            pandas.DataFrame: 每日Rank IC值
+            pandas.DataFrame: 每日Rank IC值，with_p_value为True时附带p_value列
         """
         if self.factor_data is None:
             logger.error("因子数据未加载")
@@ -334,40 +743,19 @@ class FactorAnalyzer:
         
         try:
             # 合并因子数据和收益率数据
-            # 优化：只保留需要的列，减少内存使用
-            merged_data = pd.merge(
-                self.factor_data[['ts_code', 'trade_date', 'factor_value']],
-                self.return_data[['ts_code', 'trade_date', 'return']],
-                on=['ts_code', 'trade_date'],
-                how='inner'
-            )
-            
+            merged_data = self._merge_factor_and_return()
             logger.info(f"合并后数据量: {len(merged_data)} 条")
             
-            # 预计算秩以提高效率
-            merged_data['factor_rank'] = merged_data.groupby('trade_date')['factor_value'].rank()
-            merged_data['return_rank'] = merged_data.groupby('trade_date')['return'].rank()
-            
-            # 计算每日Rank IC（使用皮尔逊相关系数计算秩相关）
-            def calc_daily_rank_ic(group):
-                if len(group) < 2:
-                    return pd.Series({'rank_ic': np.nan, 'p_value': np.nan})
-                
-                # 检查因子秩或收益率秩是否为恒定值
-                if group['factor_rank'].nunique() <= 1 or group['return_rank'].nunique() <= 1:
-                    return pd.Series({'rank_ic': np.nan, 'p_value': np.nan})
-                
-                try:
-                    # 计算秩相关系数
-                    rank_ic, p_value = spearmanr(group['factor_rank'], group['return_rank'])
-                    return pd.Series({'rank_ic': rank_ic, 'p_value': p_value})
-                except Exception as e:
-                    logger.warning(f"计算Rank IC时发生警告: {str(e)}")
-                    return pd.Series({'rank_ic': np.nan, 'p_value': np.nan})
+            if USE_POLARS and pl is not None:
+                daily_rank_ic = self._calculate_rank_ic_polars(merged_data)
+            elif USE_NUMBA and daily_spearman is not None:
+                daily_rank_ic = self._calculate_rank_ic_numba(merged_data)
+            else:
+                daily_rank_ic = self._calculate_rank_ic_pandas(merged_data)
             
-            # 使用groupby + apply计算每日Rank IC
-            daily_rank_ic = merged_data.groupby('trade_date', group_keys=False).apply(calc_daily_rank_ic, include_groups=False).reset_index()
-            daily_rank_ic = daily_rank_ic.sort_values('trade_date')
+            if with_p_value:
+                daily_rank_ic['p_value'] = self._calculate_rank_ic_p_value(
+                    daily_rank_ic, merged_data.groupby('trade_date').size())
             
             logger.info(f"Rank IC计算完成，共 {len(daily_rank_ic)} 个交易日")
             return daily_rank_ic
@@ -375,12 +763,117 @@ class FactorAnalyzer:
             logger.error(f"计算Rank IC失败: {str(e)}")
             return None
     
-    def calculate_ir(self, rank_ic_data):
+    def _calculate_rank_ic_pandas(self, merged_data):
+        """
+        使用pandas向量化计算每日Rank IC
+        
+        参数:
+            merged_data: 合并后的因子和收益率数据
+            
+        返回:
+            pandas.DataFrame: 每日Rank IC值
+        """
+        # 按交易日计算秩（Spearman相关系数等于秩的皮尔逊相关系数）
+        merged_data[['factor_rank', 'return_rank']] = merged_data.groupby('trade_date')[['factor_value', 'return']].rank()
+
+        # 向量化计算每日秩的皮尔逊相关系数，避免逐日调用Python函数
+        # 平均秩的均值恒为(n+1)/2（并列取平均秩不改变秩和），无需再逐日求均值；
+        # 无并列时分母即n(n^2-1)/12，结果与闭式公式1-6Σd²/(n(n²-1))一致
+        dates = merged_data['trade_date']
+        daily = merged_data.groupby('trade_date')
+        n = daily.size()
+        center = (daily['factor_rank'].transform('size') + 1) / 2.0
+        fx = merged_data['factor_rank'] - center
+        ry = merged_data['return_rank'] - center
+        num = (fx * ry).groupby(dates).sum()
+        den = np.sqrt((fx * fx).groupby(dates).sum() * (ry * ry).groupby(dates).sum())
+
+        # 样本数不足或秩为恒定值（分母为0）时Rank IC记为NaN，该交易日仍保留在结果中
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rank_ic = num / den
+        rank_ic = rank_ic.where((den > 0) & (n >= 2))
+
+        daily_rank_ic = rank_ic.rename('rank_ic').reset_index()
+        return daily_rank_ic.sort_values('trade_date')
+    
+    def _calculate_rank_ic_p_value(self, daily_rank_ic, daily_counts):
+        """
+        根据每日Rank IC和样本数计算双侧p值，t = r*sqrt((n-2)/(1-r^2))
+        
+        参数:
+            daily_rank_ic: 每日Rank IC值
+            daily_counts: 每个交易日的样本数（以trade_date为索引）
+            
+        返回:
+            numpy.ndarray: 每日p值
+        """
+        r = daily_rank_ic['rank_ic'].to_numpy(dtype=np.float64)
+        df = daily_counts.reindex(daily_rank_ic['trade_date']).to_numpy(dtype=np.float64) - 2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = r * np.sqrt(df / (1.0 - r * r))
+        return 2 * stats.t.sf(np.abs(t), df)
+    
+    def _calculate_rank_ic_polars(self, merged_data):
+        """
+        使用Polars并行计算每日Rank IC
+        
+        参数:
+            merged_data: 合并后的因子和收益率数据
+            
+        返回:
+            pandas.DataFrame: 每日Rank IC值
+        """
+        daily_rank_ic = (
+            pl.from_pandas(merged_data[['trade_date', 'factor_value', 'return']])
+            .group_by('trade_date')
+            .agg(
+                pl.corr(pl.col('factor_value').rank(), pl.col('return').rank()).alias('rank_ic'),
+                pl.len().alias('n')
+            )
+            # 与pandas实现一致，样本数不足2的交易日Rank IC记为NaN
+            .with_columns(pl.when(pl.col('n') >= 2).then(pl.col('rank_ic')).otherwise(np.nan).alias('rank_ic'))
+            .sort('trade_date')
+            .select(['trade_date', 'rank_ic'])
+        )
+        return daily_rank_ic.to_pandas()
+    
+    def _calculate_rank_ic_numba(self, merged_data):
+        """
+        使用Numba并行内核计算每日Rank IC
+        
+        参数:
+            merged_data: 合并后的因子和收益率数据
+            
+        返回:
+            pandas.DataFrame: 每日Rank IC值
+        """
+        # 合并结果通常已按交易日排序，仅在无序时重新排序
+        if not merged_data['trade_date'].is_monotonic_increasing:
+            merged_data = merged_data.sort_values('trade_date', kind='stable')
+        dates = merged_data['trade_date'].to_numpy()
+        trade_dates = np.unique(dates)
+        
+        # 每个交易日在排序后数组中的起止位置
+        offsets = np.append(np.searchsorted(dates, trade_dates), len(dates))
+        rank_ic = np.empty(len(trade_dates), dtype=np.float64)
+        daily_spearman(
+            offsets,
+            merged_data['factor_value'].to_numpy(dtype=np.float64),
+            merged_data['return'].to_numpy(dtype=np.float64),
+            rank_ic
+        )
+        
+        # 与pandas实现一致，样本数不足2的交易日由内核记为NaN
+        return pd.DataFrame({'trade_date': trade_dates, 'rank_ic': rank_ic})
+    
+    def calculate_ir(self, rank_ic_data, mean_rank_ic=None, std_rank_ic=None):
         """
         计算IR (Information Ratio)
         
         参数:
             rank_ic_data: Rank IC数据
+            mean_rank_ic: 已计算的Rank IC均值（可选，与std_rank_ic同时提供时不再重复计算）
+            std_rank_ic: 已计算的Rank IC标准差（可选）
             
         返回:
             float: IR值
@@ -390,17 +883,22 @@ class FactorAnalyzer:
             return None
         
         try:
-            # 移除NaN值
-            valid_rank_ic = rank_ic_data['rank_ic'].dropna()
-            
-            if len(valid_rank_ic) == 0:
+            if mean_rank_ic is None or std_rank_ic is None:
+                # 直接在NumPy数组上移除NaN值并计算均值和标准差
+                rank_ic = rank_ic_data['rank_ic'].to_numpy(dtype=np.float64)
+                valid_rank_ic = rank_ic[~np.isnan(rank_ic)]
+                
+                if len(valid_rank_ic) == 0:
+                    logger.error("没有有效的Rank IC数据")
+                    return None
+                
+                # 计算IR
+                mean_rank_ic = valid_rank_ic.mean()
+                std_rank_ic = valid_rank_ic.std(ddof=1) if len(valid_rank_ic) > 1 else np.nan
+            elif np.isnan(mean_rank_ic):
                 logger.error("没有有效的Rank IC数据")
                 return None
             
-            # 计算IR
-            mean_rank_ic = valid_rank_ic.mean()
-            std_rank_ic = valid_rank_ic.std()
-            
             if std_rank_ic == 0:
                 logger.error("Rank IC的标准差为0，无法计算IR")
                 return None
@@ -429,17 +927,13 @@ class FactorAnalyzer:
             logger.info(f"开始分析因子: {factor_name}")
             
             # 加载因子数据
-            if not self.load_factor_data(factor_name, start_date, end_date, normalize=NORMALIZE_FACTOR):
+            # 横截面标准化是逐日的单调线性变换，不改变每日排序，Rank IC和分组结果与其无关，因此跳过
+            # 时间序列标准化按股票分别缩放，会改变横截面排序，仍需保留
+            if not self.load_factor_data(factor_name, start_date, end_date, normalize=False):
                 return None
             
             # 加载收益率数据 - 调整结束日期以确保有足够数据计算远期收益
-            # 收益率计算需要forward_period天的后续数据，所以结束日期应后移
-            return_end_date = None
-            if end_date:
-                # 将结束日期转换为datetime并添加forward_period天
-                end_date_dt = pd.to_datetime(end_date)
-                return_end_date = (end_date_dt + pd.Timedelta(days=forward_period)).strftime('%Y-%m-%d')
-            
+            return_end_date = self.get_return_end_date(end_date, forward_period)
             if not self.load_return_data(start_date, return_end_date, forward_period):
                 return None
             
@@ -448,21 +942,26 @@ class FactorAnalyzer:
             if rank_ic_data is None:
                 return None
             
-            # 计算IR
-            ir = self.calculate_ir(rank_ic_data)
-            
-            # 计算统计指标
-            valid_rank_ic = rank_ic_data['rank_ic'].dropna()
+            # 在同一个NumPy数组上一次性计算统计指标
+            rank_ic = rank_ic_data['rank_ic'].to_numpy(dtype=np.float64)
+            valid_rank_ic = rank_ic[~np.isnan(rank_ic)]
+            total_days = valid_rank_ic.size
+            if total_days == 0:
+                logger.warning(f"因子 {factor_name} 没有有效的Rank IC数据，跳过该因子")
+                return None
             mean_rank_ic = valid_rank_ic.mean()
-            std_rank_ic = valid_rank_ic.std()
-            positive_days = len(valid_rank_ic[valid_rank_ic > 0])
-            total_days = len(valid_rank_ic)
-            positive_ratio = positive_days / total_days if total_days > 0 else 0
+            std_rank_ic = valid_rank_ic.std(ddof=1) if total_days > 1 else np.nan
+            positive_days = np.count_nonzero(valid_rank_ic > 0)
+            positive_ratio = positive_days / total_days
+            
+            # 计算IR，复用上面的均值和标准差
+            ir = self.calculate_ir(rank_ic_data, mean_rank_ic, std_rank_ic)
             
             result = {
                 'factor_name': factor_name,
                 'forward_period': forward_period,
                 'mean_rank_ic': mean_rank_ic,
+                'abs_mean_rank_ic': abs(mean_rank_ic),  # 缓存IC绝对值，供排序和报告复用
                 'std_rank_ic': std_rank_ic,
                 'ir': ir,
                 'positive_ratio': positive_ratio,
@@ -505,39 +1004,34 @@ class FactorAnalyzer:
                 logger.error("无效的Rank IC数据")
                 return False
             
-            # 确保目录存在
-            if not os.path.exists('report/figures'):
-                os.makedirs('report/figures')
-            
             # 绘制IC时间序列图
-            plt.figure(figsize=(15, 8))
-            plt.plot(rank_ic_data['trade_date'], rank_ic_data['rank_ic'], 
-                     color='#1f77b4', alpha=0.8, linewidth=2, label='Rank IC')
+            fig, ax = self._get_figure((15, 8))
+            ax.plot(rank_ic_data['trade_date'], rank_ic_data['rank_ic'], 
+                    color='#1f77b4', alpha=0.8, linewidth=2, label='Rank IC')
             
             # 添加均值线
             mean_ic = rank_ic_data['rank_ic'].mean()
-            plt.axhline(y=mean_ic, color='#ff7f0e', linestyle='--', linewidth=2, 
+            ax.axhline(y=mean_ic, color='#ff7f0e', linestyle='--', linewidth=2, 
                        label=f'平均Rank IC: {mean_ic:.4f}')
             
             # 添加零线
-            plt.axhline(y=0, color='#2ca02c', linestyle='-', linewidth=1)
+            ax.axhline(y=0, color='#2ca02c', linestyle='-', linewidth=1)
             
             # 设置图表标题和标签
-            plt.title(f'{factor_name} 因子 Rank IC 时间序列', fontsize=16)
-            plt.xlabel('日期', fontsize=12)
-            plt.ylabel('Rank IC 值', fontsize=12)
-            plt.grid(True, alpha=0.3)
-            plt.legend(fontsize=12)
+            ax.set_title(f'{factor_name} 因子 Rank IC 时间序列', fontsize=16)
+            ax.set_xlabel('日期', fontsize=12)
+            ax.set_ylabel('Rank IC 值', fontsize=12)
+            ax.grid(True, alpha=0.3)
+            ax.legend(fontsize=12)
             
             # 旋转x轴标签
-            plt.xticks(rotation=45)
-            plt.tight_layout()
+            ax.tick_params(axis='x', labelrotation=45)
+            fig.tight_layout()
             
             # 保存图片
             if not save_path:
-                save_path = f'report/figures/{factor_name}_ic_time_series_{datetime.now().strftime("%Y%m%d_%H%M%S")}.png'
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            plt.close()
+                save_path = os.path.join(self.figure_dir, f'{factor_name}_ic_time_series_{self._run_stamp}.png')
+            fig.savefig(save_path, dpi=FIGURE_DPI)
             
             logger.info(f"因子 {factor_name} 的IC时间序列图已保存至: {save_path}")
             return True
@@ -562,74 +1056,26 @@ class FactorAnalyzer:
         try:
             logger.info(f"开始对因子 {factor_name} 进行分组收益分析...")
             
-            # 加载因子数据
-            if not self.load_factor_data(factor_name, start_date, end_date, normalize=NORMALIZE_FACTOR):
-                return None
-            
-            # 加载收益率数据
-            return_end_date = None
-            if end_date:
-                end_date_dt = pd.to_datetime(end_date)
-                return_end_date = (end_date_dt + pd.Timedelta(days=forward_period)).strftime('%Y-%m-%d')
-            
-            if not self.load_return_data(start_date, return_end_date, forward_period):
-                return None
-            
-            # 合并因子数据和收益率数据
-            merged_data = pd.merge(
-                self.factor_data,
-                self.return_data,
-                on=['ts_code', 'trade_date'],
-                how='inner'
-            )
-            
-            if merged_data.empty:
-                logger.error("合并后的因子和收益率数据为空")
-                return None
-            
-            logger.info(f"分组分析合并后数据量: {len(merged_data)} 条")
-            
-            # 按因子值分组并计算每组的平均收益率
-            def group_and_calc_return(daily_data):
-                # 获取当前交易日
-                trade_date = daily_data['trade_date'].iloc[0] if not daily_data.empty else None
-                
-                # 按因子值排序并分组
-                daily_data = daily_data.sort_values('factor_value')
-                
-                # 确保有足够的数据进行分组
-                if len(daily_data) < num_groups:
-                    return pd.DataFrame(columns=['trade_date', 'group', 'return'])
-                
-                # 使用pandas的rank和cut函数进行分组
-                daily_data['factor_rank'] = daily_data['factor_value'].rank(method='first')
-                daily_data['group'] = pd.cut(daily_data['factor_rank'], bins=num_groups, labels=False) + 1
-                
-                # 计算每组的平均收益率
-                group_returns = daily_data.groupby('group')['return'].mean().reset_index()
-                
-                # 添加trade_date列
-                group_returns['trade_date'] = trade_date
-                
-                return group_returns
-            
-            # 按日期分组计算每日的分组收益率
-            daily_group_returns = merged_data.groupby('trade_date', group_keys=False).apply(group_and_calc_return)
-            
-            # 确保结果是DataFrame格式
-            if isinstance(daily_group_returns, pd.Series):
-                daily_group_returns = daily_group_returns.to_frame()
-            
-            # 重置索引（如果需要）
-            if daily_group_returns.index.nlevels > 1:
-                daily_group_returns = daily_group_returns.reset_index(drop=True)
-            
-            # 确保有trade_date列
-            if 'trade_date' not in daily_group_returns.columns and not daily_group_returns.empty:
-                # 尝试从索引中获取trade_date
-                if hasattr(daily_group_returns.index, 'get_level_values') and 'trade_date' in daily_group_returns.index.names:
-                    daily_group_returns['trade_date'] = daily_group_returns.index.get_level_values('trade_date')
-                    daily_group_returns = daily_group_returns.reset_index(drop=True)
+            # 优先读取磁盘缓存，未命中时重新计算
+            cache_path, db_mtime = self._get_group_returns_cache_info(
+                factor_name, num_groups, forward_period, start_date, end_date)
+            daily_group_returns = None
+            if cache_path and os.path.exists(cache_path):
+                with open(cache_path, 'rb') as f:
+                    cached = pickle.load(f)
+                if cached.get('db_mtime') == db_mtime:
+                    daily_group_returns = cached['daily_group_returns']
+                    logger.info(f"从缓存获取因子 {factor_name} 的每日分组收益率")
+            
+            if daily_group_returns is None:
+                daily_group_returns = self._compute_daily_group_returns(
+                    factor_name, num_groups, forward_period, start_date, end_date)
+                if daily_group_returns is None:
+                    return None
+                if cache_path and not daily_group_returns.empty:
+                    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                    with open(cache_path, 'wb') as f:
+                        pickle.dump({'db_mtime': db_mtime, 'daily_group_returns': daily_group_returns}, f)
             
             # 确保有数据进行后续处理
             if daily_group_returns.empty:
@@ -642,7 +1088,9 @@ class FactorAnalyzer:
             # 计算各组的平均收益率
             avg_group_returns = daily_group_returns.groupby('group')['return'].mean() * 100  # 转换为百分比
             
-            logger.info(f"分组收益分析完成，共 {len(daily_group_returns['trade_date'].unique())} 个交易日")
+            # 交易日数量只统计一次，日志和返回结果共用
+            total_days = daily_group_returns['trade_date'].nunique()
+            logger.info(f"分组收益分析完成，共 {total_days} 个交易日")
             # 使用group_num作为循环变量名，避免与pandas内部变量冲突
             for group_num in range(1, num_groups + 1):
                 if group_num in avg_group_returns.index:
@@ -657,14 +1105,142 @@ class FactorAnalyzer:
                 'forward_period': forward_period,
                 'avg_group_returns': avg_group_returns.to_dict(),
                 'daily_group_returns': daily_group_returns,
-                'total_days': len(daily_group_returns['trade_date'].unique())
+                'total_days': total_days
             }
         except Exception as e:
             logger.error(f"分组收益分析失败: {str(e)}")
-            import traceback
             logger.error(f"异常堆栈信息: {traceback.format_exc()}")
             return None
     
+    def _compute_daily_group_returns(self, factor_name, num_groups, forward_period, start_date, end_date):
+        """
+        加载因子和收益率数据并计算每日各组平均收益率
+        
+        参数:
+            factor_name: 因子名称
+            num_groups: 分组数量
+            forward_period: 向前预测周期
+            start_date: 开始日期
+            end_date: 结束日期
+            
+        返回:
+            pandas.DataFrame: 每日各组平均收益率，数据加载失败时返回None
+        """
+        # 加载因子数据
+        # 横截面标准化是逐日的单调线性变换，不改变每日排序，Rank IC和分组结果与其无关，因此跳过
+        # 时间序列标准化按股票分别缩放，会改变横截面排序，仍需保留
+        if not self.load_factor_data(factor_name, start_date, end_date, normalize=False):
+            return None
+        
+        # 加载收益率数据
+        return_end_date = self.get_return_end_date(end_date, forward_period)
+        if not self.load_return_data(start_date, return_end_date, forward_period):
+            return None
+        
+        # 合并因子数据和收益率数据
+        merged_data = self._merge_factor_and_return()
+        
+        if merged_data.empty:
+            logger.error("合并后的因子和收益率数据为空")
+            return None
+        
+        logger.info(f"分组分析合并后数据量: {len(merged_data)} 条")
+        
+        if USE_POLARS and pl is not None:
+            return self._calculate_group_returns_polars(merged_data, num_groups)
+        return self._calculate_group_returns_pandas(merged_data, num_groups)
+    
+    def _get_group_returns_cache_info(self, factor_name, num_groups, forward_period, start_date, end_date):
+        """
+        获取每日分组收益率磁盘缓存的路径和数据库文件的修改时间
+        缓存键包含分析参数、测试范围和股票列表，股票列表变化或数据库文件更新后缓存自动失效
+        
+        参数:
+            factor_name: 因子名称
+            num_groups: 分组数量
+            forward_period: 向前预测周期
+            start_date: 开始日期
+            end_date: 结束日期
+            
+        返回:
+            tuple: (缓存文件路径, 数据库修改时间)，未开启缓存或内存数据库时返回(None, None)
+        """
+        if not CACHE_GROUP_RETURNS:
+            return None, None
+        
+        db_file = self.conn.execute("PRAGMA database_list").fetchone()[2]
+        if not db_file or not os.path.exists(db_file):
+            return None, None
+        
+        universe_hash = hashlib.blake2b(",".join(sorted(self.get_test_stocks())).encode(), digest_size=8).hexdigest()
+        key = repr((factor_name, num_groups, forward_period, start_date, end_date,
+                    self.test_scope, self.individual_stock, universe_hash))
+        cache_name = f"group_returns_{hashlib.blake2b(key.encode(), digest_size=16).hexdigest()}.pkl"
+        cache_path = os.path.join(BASE_DIRS['TEMP'], 'cache', cache_name)
+        return cache_path, os.path.getmtime(db_file)
+    
+    def _calculate_group_returns_pandas(self, merged_data, num_groups):
+        """
+        使用pandas按交易日分组计算各组平均收益率
+        
+        参数:
+            merged_data: 合并后的因子和收益率数据
+            num_groups: 分组数量
+            
+        返回:
+            pandas.DataFrame: 每日各组平均收益率，包含trade_date、group、return列
+        """
+        # 每个交易日内按因子值排序后的序号（并列值按出现顺序）及当日样本数
+        daily_factor = merged_data.groupby('trade_date')['factor_value']
+        factor_rank = daily_factor.rank(method='first')
+        n = daily_factor.transform('size')
+        
+        # 样本数不足num_groups的交易日不参与分组
+        valid = n >= num_groups
+        merged_data = merged_data.loc[valid, ['trade_date', 'return']]
+        factor_rank = factor_rank[valid]
+        n = n[valid]
+        
+        # 将序号1..n等宽切分为num_groups组（与pd.cut(rank, bins=num_groups)规则一致，区间右闭）
+        group = np.ceil((factor_rank - 1) * num_groups / np.maximum(n - 1, 1)).clip(lower=1)
+        merged_data['group'] = group.astype('int64')
+        
+        # 一次性计算每日各组的平均收益率
+        daily_group_returns = merged_data.groupby(['trade_date', 'group'])['return'].mean().reset_index()
+        
+        return daily_group_returns
+    
+    def _calculate_group_returns_polars(self, merged_data, num_groups):
+        """
+        使用Polars并行按交易日分组计算各组平均收益率
+        分组规则与pandas实现一致：按因子值排序后的序号等宽切分为num_groups组
+        
+        参数:
+            merged_data: 合并后的因子和收益率数据
+            num_groups: 分组数量
+            
+        返回:
+            pandas.DataFrame: 每日各组平均收益率，包含trade_date、group、return列
+        """
+        rank = pl.col('factor_value').rank('ordinal').over('trade_date')
+        n = pl.len().over('trade_date')
+        group = (
+            ((rank - 1) * num_groups / pl.max_horizontal(n - 1, 1))
+            .ceil()
+            .clip(lower_bound=1)
+            .cast(pl.Int64)
+        )
+        daily_group_returns = (
+            pl.from_pandas(merged_data[['trade_date', 'factor_value', 'return']])
+            .filter(n >= num_groups)
+            .with_columns(group.alias('group'))
+            .group_by(['trade_date', 'group'])
+            .agg(pl.col('return').mean())
+            .sort(['trade_date', 'group'])
+            .select(['trade_date', 'group', 'return'])
+        )
+        return daily_group_returns.to_pandas()
+    
     def plot_group_returns(self, factor_name, avg_group_returns, num_groups):
         """
         绘制分组收益单调性图表
@@ -675,44 +1251,39 @@ class FactorAnalyzer:
             num_groups: 分组数量
         """
         try:
-            # 确保目录存在
-            if not os.path.exists('report/figures'):
-                os.makedirs('report/figures')
-            
-            plt.figure(figsize=(12, 8))
+            fig, ax = self._get_figure((12, 8))
             
             # 获取分组和对应的收益率
             groups = list(avg_group_returns.index)
             returns = list(avg_group_returns.values)
             
             # 绘制柱状图
-            bars = plt.bar(groups, returns, color='#1f77b4', alpha=0.8, edgecolor='black', linewidth=1)
+            bars = ax.bar(groups, returns, color='#1f77b4', alpha=0.8, edgecolor='black', linewidth=1)
             
             # 在柱状图上添加数值标签
             for bar, value in zip(bars, returns):
                 height = bar.get_height()
-                plt.text(bar.get_x() + bar.get_width()/2., height, 
+                ax.text(bar.get_x() + bar.get_width()/2., height, 
                         f'{value:.4f}%', ha='center', va='bottom', fontsize=10)
             
             # 绘制折线图（显示单调性）
-            plt.plot(groups, returns, color='#ff7f0e', marker='o', linewidth=3, markersize=8)
+            ax.plot(groups, returns, color='#ff7f0e', marker='o', linewidth=3, markersize=8)
             
             # 设置图表标题和标签
-            plt.title(f'{factor_name} 因子分组收益分析 (Top{int(num_groups/2)} - Bottom{int(num_groups/2)} = {returns[-1] - returns[0]:.4f}%)', 
-                      fontsize=16)
-            plt.xlabel('因子分组 (1=最低因子值, {}=最高因子值)'.format(num_groups), fontsize=12)
-            plt.ylabel('平均收益率 (%)', fontsize=12)
-            plt.grid(True, alpha=0.3)
+            ax.set_title(f'{factor_name} 因子分组收益分析 (Top{int(num_groups/2)} - Bottom{int(num_groups/2)} = {returns[-1] - returns[0]:.4f}%)', 
+                         fontsize=16)
+            ax.set_xlabel('因子分组 (1=最低因子值, {}=最高因子值)'.format(num_groups), fontsize=12)
+            ax.set_ylabel('平均收益率 (%)', fontsize=12)
+            ax.grid(True, alpha=0.3)
             
             # 设置x轴刻度
-            plt.xticks(groups)
+            ax.set_xticks(groups)
             
-            plt.tight_layout()
+            fig.tight_layout()
             
             # 保存图片
-            save_path = f'report/figures/{factor_name}_group_returns_{datetime.now().strftime("%Y%m%d_%H%M%S")}.png'
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            plt.close()
+            save_path = os.path.join(self.figure_dir, f'{factor_name}_group_returns_{self._run_stamp}.png')
+            fig.savefig(save_path, dpi=FIGURE_DPI)
             
             logger.info(f"因子 {factor_name} 的分组收益图已保存至: {save_path}")
             return True
@@ -752,20 +1323,12 @@ class FactorAnalyzer:
             
             logger.info(f"成功加载 {len(factor_data_dict)} 个因子的数据")
             
-            # 合并所有因子数据
-            merged_factor_data = None
-            for factor_name, factor_data in factor_data_dict.items():
-                if merged_factor_data is None:
-                    merged_factor_data = factor_data
-                    merged_factor_data = merged_factor_data.rename(columns={'factor_value': factor_name})
-                else:
-                    merged_factor_data = pd.merge(
-                        merged_factor_data,
-                        factor_data,
-                        on=['ts_code', 'trade_date'],
-                        how='inner'
-                    )
-                    merged_factor_data = merged_factor_data.rename(columns={'factor_value': factor_name})
+            # 合并所有因子数据：按(ts_code, trade_date)索引一次内连接拼接，不再逐个因子两两合并
+            merged_factor_data = pd.concat(
+                [factor_data.set_index(['ts_code', 'trade_date'])['factor_value'].rename(factor_name)
+                 for factor_name, factor_data in factor_data_dict.items()],
+                axis=1, join='inner'
+            ).reset_index()
             
             if merged_factor_data.empty:
                 logger.error("合并后的因子数据为空")
@@ -805,19 +1368,17 @@ class FactorAnalyzer:
             correlation_matrix: 相关系数矩阵
         """
         try:
-            # 确保目录存在
-            if not os.path.exists('report/figures'):
-                os.makedirs('report/figures')
-            
             # 增加图表尺寸，根据因子数量动态调整
             n_factors = len(correlation_matrix.columns)
             figsize = (min(20, n_factors * 1.5), min(18, n_factors * 1.3))
-            plt.figure(figsize=figsize)
+            fig, ax = self._get_figure(figsize)
             
-            # 绘制热力图
+            # 绘制热力图，色块栅格化以减少渲染开销
             mask = np.triu(np.ones_like(correlation_matrix, dtype=bool))  # 遮盖上三角
             sns.heatmap(
                 correlation_matrix.round(2),  # 保留两位小数
+                ax=ax,
+                rasterized=True,
                 mask=mask,
                 annot=True,
                 cmap='coolwarm',
@@ -830,20 +1391,19 @@ class FactorAnalyzer:
             )
             
             # 调整坐标轴刻度字体大小和旋转角度
-            plt.xticks(rotation=60, ha='right', fontsize=6, rotation_mode='anchor')  # 旋转x轴标签，增加倾斜角度
-            plt.yticks(rotation=0, fontsize=6)  # 调整y轴标签字体大小
+            plt.setp(ax.get_xticklabels(), rotation=60, ha='right', fontsize=6, rotation_mode='anchor')  # 旋转x轴标签，增加倾斜角度
+            plt.setp(ax.get_yticklabels(), rotation=0, fontsize=6)  # 调整y轴标签字体大小
             
             # 设置图表标题和标签
-            plt.title('因子间相关系数矩阵', fontsize=12, pad=20)  # 减小标题字体大小
+            ax.set_title('因子间相关系数矩阵', fontsize=12, pad=20)  # 减小标题字体大小
             
             # 调整布局，增加内边距
-            plt.subplots_adjust(left=0.15, right=0.95, top=0.9, bottom=0.15)
-            plt.tight_layout()
+            fig.subplots_adjust(left=0.15, right=0.95, top=0.9, bottom=0.15)
+            fig.tight_layout()
             
             # 保存图片
-            save_path = f'report/figures/factor_correlation_{datetime.now().strftime("%Y%m%d_%H%M%S")}.png'
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            plt.close()
+            save_path = os.path.join(self.figure_dir, f'factor_correlation_{self._run_stamp}.png')
+            fig.savefig(save_path, dpi=FIGURE_DPI)
             
             logger.info(f"因子间相关系数热力图已保存至: {save_path}")
             return True
@@ -852,6 +1412,90 @@ class FactorAnalyzer:
             return False
 
 
+def analyze_single_factor(analyzer, factor):
+    """
+    分析单个因子：计算Rank IC和IR，绘制IC时间序列图并进行分组收益分析
+    
+    参数:
+        analyzer: 因子分析器
+        factor: 因子名称
+        
+    返回:
+        dict: 因子分析结果，失败时返回None
+    """
+    logger.info(f"开始分析因子: {factor}")
+    result = analyzer.analyze_factor(factor, forward_period=FORWARD_PERIOD, 
+                                     start_date=START_DATE, 
+                                     end_date=END_DATE)
+    if result:
+        # 绘制IC时间序列图
+        analyzer.plot_ic_time_series(factor, result['rank_ic_data'])
+        
+        # 分组收益分析
+        analyzer.analyze_group_returns(factor, num_groups=GROUP_NUM, forward_period=FORWARD_PERIOD, start_date=START_DATE, end_date=END_DATE)
+        
+        logger.info(f"因子 {factor} 分析完成")
+    else:
+        logger.warning(f"因子 {factor} 分析失败，跳过该因子")
+    return result
+
+
+# 工作进程内的因子分析器，由_init_factor_worker创建
+_worker_analyzer = None
+
+
+def _share_return_data(return_data):
+    """
+    将收益率数据写为未压缩的Arrow IPC（Feather）文件，供工作进程内存映射读取
+    
+    参数:
+        return_data: 收益率数据
+        
+    返回:
+        str: 文件路径，未安装pyarrow或写入失败时返回原数据
+    """
+    if feather is None or return_data is None or return_data.empty:
+        return return_data
+    try:
+        panel_path = os.path.join(BASE_DIRS['TEMP'], 'cache', f'return_data_{os.getpid()}.arrow')
+        os.makedirs(os.path.dirname(panel_path), exist_ok=True)
+        feather.write_feather(return_data, panel_path, compression='uncompressed')
+        return panel_path
+    except Exception as e:
+        logger.warning(f"写入收益率共享文件失败，改为直接传递数据: {str(e)}")
+        return return_data
+
+
+def _init_factor_worker(db_path, test_scope, individual_stock, return_data, return_data_key, log_queue):
+    """
+    工作进程初始化：建立独立的数据库连接，并直接使用主进程已加载的收益率数据
+    
+    参数:
+        db_path: 数据库文件路径
+        test_scope: 测试范围
+        individual_stock: 单个股票代码
+        return_data: 主进程已加载的收益率数据，或_share_return_data写出的Arrow文件路径
+        return_data_key: 收益率数据对应的(开始日期, 结束日期, 预测周期)
+        log_queue: 日志队列，工作进程的日志经主进程统一写出
+    """
+    global _worker_analyzer
+    use_queue_handler(logger, log_queue)
+    if isinstance(return_data, str):
+        # 内存映射读取，各工作进程通过系统页缓存共享同一份文件
+        return_data = feather.read_table(return_data, memory_map=True).to_pandas()
+    _worker_analyzer = FactorAnalyzer(sqlite3.connect(db_path))
+    _worker_analyzer.set_test_scope(test_scope, individual_stock)
+    _worker_analyzer.return_data = return_data
+    _worker_analyzer._return_data_key = return_data_key
+
+
+def _analyze_factor_worker(factor):
+    """
+    在工作进程中分析单个因子
+    """
+    return analyze_single_factor(_worker_analyzer, factor)
+
+
 def get_all_available_factors(conn):
     """
     获取所有可用的因子名称
@@ -921,10 +1565,32 @@ def get_all_available_factors(conn):
         return []
 
 
+def _to_json_value(value):
+    """
+    将NaN和无穷大转换为None（标准JSON不支持NaN），orjson和json输出的报告保持一致
+    
+    参数:
+        value: 报告中的数值
+        
+    返回:
+        float或None: 有限数值转换为Python float，其他数值返回None，非数值原样返回
+    """
+    if isinstance(value, (float, np.floating)):
+        return float(value) if np.isfinite(value) else None
+    return value
+
+
 def main():
     """
     主函数
     """
+    # 图表只保存为图片，使用非交互式后端；工作进程通过环境变量使用同一后端
+    os.environ['MPLBACKEND'] = 'Agg'
+    plt.switch_backend('Agg')
+    
+    # 每次运行设置新的时间戳，报告、图表以及之后创建的工作进程均使用该时间戳
+    set_run_timestamp()
+    
     # 显示当前配置
     logger.info(f"当前测试配置:")
     logger.info(f"  测试范围: {TEST_SCOPE}")
@@ -955,63 +1621,83 @@ def main():
         logger.info(f"可用因子列表: {factors}")
         
         # 分析所有因子
-        results = []
-        for factor in factors:
-            logger.info(f"开始分析因子: {factor}")
-            result = analyzer.analyze_factor(factor, forward_period=FORWARD_PERIOD, 
-                                           start_date=START_DATE, 
-                                           end_date=END_DATE)
-            if result:
-                # 绘制IC时间序列图
-                analyzer.plot_ic_time_series(factor, result['rank_ic_data'])
-                
-                # 分组收益分析
-                analyzer.analyze_group_returns(factor, num_groups=GROUP_NUM, forward_period=FORWARD_PERIOD, start_date=START_DATE, end_date=END_DATE)
-                
-                results.append(result)
-                logger.info(f"因子 {factor} 分析完成")
-            else:
-                logger.warning(f"因子 {factor} 分析失败，跳过该因子")
+        max_workers = MAX_WORKERS or os.cpu_count()
+        db_path = conn.execute("PRAGMA database_list").fetchone()[2]
+        parallel = max_workers > 1 and len(factors) > 1 and db_path
+        if parallel:
+            # 多进程并行分析，收益率数据只加载一次并在进程初始化时分发
+            logger.info(f"使用 {max_workers} 个进程并行分析因子")
+            # 与analyze_factor使用相同的收益率结束日期，工作进程才能直接复用这份数据
+            return_end_date = analyzer.get_return_end_date(END_DATE, FORWARD_PERIOD)
+            analyzer.load_return_data(start_date=START_DATE, end_date=return_end_date, forward_period=FORWARD_PERIOD)
+            shared_return_data = _share_return_data(analyzer.return_data)
+            log_queue, log_listener = start_queue_listener(logger)
+            try:
+                with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_factor_worker,
+                                         initargs=(db_path, analyzer.test_scope, analyzer.individual_stock,
+                                                   shared_return_data, analyzer._return_data_key,
+                                                   log_queue)) as executor:
+                    factor_results = list(executor.map(_analyze_factor_worker, factors))
+            finally:
+                stop_queue_listener(log_listener)
+                if isinstance(shared_return_data, str) and os.path.exists(shared_return_data):
+                    os.remove(shared_return_data)
+        else:
+            # 一次查询批量加载所有因子数据，避免逐个因子查询数据库
+            analyzer.preload_factor_data(factors, start_date=START_DATE, end_date=END_DATE)
+            factor_results = [analyze_single_factor(analyzer, factor) for factor in factors]
+        results = [result for result in factor_results if result]
         
         # 因子间相关性分析
         if results:
             logger.info("开始进行因子间相关性分析...")
+            if parallel:
+                # 并行分析时工作进程各自加载因子数据，主进程在相关性分析前才批量加载
+                analyzer.preload_factor_data(factors, start_date=START_DATE, end_date=END_DATE)
             analyzer.analyze_factor_correlation(factors, start_date=START_DATE, end_date=END_DATE)
         
         # 打印分析结果汇总 - 按IC绝对值排序
         if results:
-            # 按平均Rank IC的绝对值排序
-            results_sorted = sorted(results, key=lambda x: abs(x['mean_rank_ic']), reverse=True)
-            
-            logger.info("\n因子分析结果汇总 (按IC绝对值排序):")
-            logger.info("-" * 90)
-            logger.info(f"{'因子名称':<25} {'平均Rank IC':<15} {'IC绝对值':<10} {'IR':<10} {'正相关比例':<15} {'有效天数':<10}")
-            logger.info("-" * 90)
-            
+            # 报告文件名、报告内容和图表均使用本次运行的同一时间戳
+            report_stamp = get_run_timestamp()
+            report_time = datetime.strptime(report_stamp, '%Y%m%d_%H%M%S').strftime('%Y-%m-%d %H:%M:%S')
+            
+            # 按平均Rank IC的绝对值排序，控制台和txt报告共用同一排序结果和汇总表
+            results_sorted = sorted(results, key=itemgetter('abs_mean_rank_ic'), reverse=True)
+            
+            # 表头和数据行的格式模板只解析一次，循环中直接调用绑定的format方法
+            header_fmt = "{:<25} {:<15} {:<10} {:<10} {:<15} {:<10}".format
+            row_fmt = "{:<25} {:<15.4f} {:<10.4f} {:<10.4f} {:<15} {:<10}".format
+            summary_lines = [
+                "-" * 90,
+                header_fmt('因子名称', '平均Rank IC', 'IC绝对值', 'IR', '正相关比例', '有效天数'),
+                "-" * 90
+            ]
             for result in results_sorted:
-                # 安全地格式化输出，处理可能的None或NaN值
+                # 安全地格式化输出，None按NaN输出
                 mean_ic = result['mean_rank_ic']
-                ic_abs = abs(mean_ic) if mean_ic is not None else None
+                ic_abs = result['abs_mean_rank_ic']
                 ir = result['ir']
                 positive_ratio = result['positive_ratio']
                 
-                # 使用条件判断格式化数值
-                mean_ic_str = f"{mean_ic:<15.4f}" if mean_ic is not None else f"{'nan':<15}"
-                ic_abs_str = f"{ic_abs:<10.4f}" if ic_abs is not None else f"{'nan':<10}"
-                ir_str = f"{ir:<10.4f}" if ir is not None else f"{'nan':<10}"
-                positive_ratio_str = f"{positive_ratio:<15.2%}" if positive_ratio is not None else f"{'nan':<15}"
-                
-                logger.info(f"{result['factor_name']:<25} {mean_ic_str} {ic_abs_str} {ir_str} {positive_ratio_str} {result['total_days']:<10}")
-            
-            logger.info("-" * 90)
+                summary_lines.append(row_fmt(
+                    result['factor_name'],
+                    np.nan if mean_ic is None else mean_ic,
+                    np.nan if ic_abs is None else ic_abs,
+                    np.nan if ir is None else ir,
+                    'nan' if positive_ratio is None else f"{positive_ratio:.2%}",
+                    result['total_days']
+                ))
+            summary_lines.append("-" * 90)
+            summary_text = "\n".join(summary_lines)
+            
+            # 使用logging的延迟格式化，日志级别过滤掉该记录时不再拼接消息
+            logger.info("\n因子分析结果汇总 (按IC绝对值排序):\n%s", summary_text)
             
             # 生成分析报告
-            import json
-            from datetime import datetime
-            
             # 准备报告数据
             report_data = {
-                'analysis_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'analysis_time': report_time,
                 'test_config': {
                     'test_scope': TEST_SCOPE,
                     'start_date': START_DATE,
@@ -1024,21 +1710,26 @@ def main():
             
             for result in results:
                 # 转换rank_ic_data为列表以便JSON序列化
-                rank_ic_df = result['rank_ic_data'].copy()
-                
-                # 将所有Timestamp类型的列转换为字符串
+                # 按列一次性转换为Python对象，无需复制整个DataFrame；
+                # 日期列在底层datetime64数组上直接格式化为字符串，不经过逐元素的strftime
+                rank_ic_df = result['rank_ic_data']
+                rank_ic_columns = {}
                 for col in rank_ic_df.columns:
+                    values = rank_ic_df[col].to_numpy()
                     if pd.api.types.is_datetime64_any_dtype(rank_ic_df[col]):
-                        rank_ic_df[col] = rank_ic_df[col].dt.strftime('%Y-%m-%d')
-                
-                rank_ic_data_list = rank_ic_df.to_dict('records')
+                        values = np.datetime_as_string(values.astype('datetime64[D]'), unit='D')
+                    elif pd.api.types.is_float_dtype(values):
+                        # 样本不足的交易日Rank IC为NaN，输出为null
+                        values = np.where(np.isfinite(values), values.astype(object), None)
+                    rank_ic_columns[col] = values.tolist()
+                rank_ic_data_list = [dict(zip(rank_ic_columns, row)) for row in zip(*rank_ic_columns.values())]
                 
                 factor_report = {
                     'factor_name': result['factor_name'],
-                    'mean_rank_ic': result['mean_rank_ic'],
-                    'std_rank_ic': result['std_rank_ic'],
-                    'ir': result['ir'],
-                    'positive_ratio': result['positive_ratio'],
+                    'mean_rank_ic': _to_json_value(result['mean_rank_ic']),
+                    'std_rank_ic': _to_json_value(result['std_rank_ic']),
+                    'ir': _to_json_value(result['ir']),
+                    'positive_ratio': _to_json_value(result['positive_ratio']),
                     'total_days': result['total_days'],
                     'positive_days': result['positive_days'],
                     'rank_ic_data': rank_ic_data_list
@@ -1046,16 +1737,19 @@ def main():
                 report_data['factors'].append(factor_report)
             
             # 保存报告到JSON文件
-            report_filename = f"factor_analysis_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            report_filename = f"factor_analysis_report_{report_stamp}.json"
             report_path = f"report/{report_filename}"
             
             # 确保report目录存在
-            import os
-            if not os.path.exists('report'):
-                os.makedirs('report')
+            os.makedirs('report', exist_ok=True)
             
-            with open(report_path, 'w', encoding='utf-8') as f:
-                json.dump(report_data, f, ensure_ascii=False, indent=2)
+            if orjson is not None:
+                # orjson直接输出UTF-8字节，并原生支持numpy数值类型
+                with open(report_path, 'wb') as f:
+                    f.write(orjson.dumps(report_data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+            else:
+                with open(report_path, 'w', encoding='utf-8') as f:
+                    json.dump(report_data, f, ensure_ascii=False, indent=2)
             
             logger.info(f"分析报告已保存到: {report_path}")
             
@@ -1075,91 +1769,103 @@ def main():
                 })
             
             df_csv = pd.DataFrame(csv_data)
-            csv_filename = f"factor_analysis_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-            csv_path = f"report/{csv_filename}"
+            if SAVE_SUMMARY_CSV:
+                csv_filename = f"factor_analysis_summary_{report_stamp}.csv"
+                csv_path = f"report/{csv_filename}"
+                
+                df_csv.to_csv(csv_path, index=False, encoding='utf-8-sig')
+                logger.info(f"分析结果CSV已保存到: {csv_path}")
             
-            df_csv.to_csv(csv_path, index=False, encoding='utf-8-sig')
-            logger.info(f"分析结果CSV已保存到: {csv_path}")
+            if pq is not None:
+                try:
+                    # 汇总结果和所有因子的每日Rank IC（长表格式）保存为zstd压缩的Parquet文件
+                    summary_parquet_path = f"report/factor_analysis_summary_{report_stamp}.parquet"
+                    pq.write_table(pa.Table.from_pandas(df_csv, preserve_index=False), summary_parquet_path,
+                                   compression='zstd')
+                    
+                    # 逐日Rank IC以float32写入，文件体积减半；txt/json报告中的统计量仍按float64计算
+                    rank_ic_table = pa.concat_tables([
+                        pa.Table.from_pandas(
+                            result['rank_ic_data'][['trade_date', 'rank_ic']].astype({'rank_ic': 'float32'})
+                            .assign(factor_name=result['factor_name']),
+                            preserve_index=False
+                        )
+                        for result in results
+                    ])
+                    rank_ic_parquet_path = f"report/factor_rank_ic_{report_stamp}.parquet"
+                    pq.write_table(rank_ic_table.select(['factor_name', 'trade_date', 'rank_ic']), rank_ic_parquet_path,
+                                   compression='zstd', use_dictionary=True)
+                    logger.info(f"分析结果Parquet已保存到: {summary_parquet_path}, {rank_ic_parquet_path}")
+                except Exception as e:
+                    logger.error(f"保存Parquet格式分析结果失败: {str(e)}")
             
             # 生成详细的txt报告
-            txt_filename = f"factor_analysis_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+            txt_filename = f"factor_analysis_report_{report_stamp}.txt"
             txt_path = f"report/{txt_filename}"
             
-            with open(txt_path, 'w', encoding='utf-8') as f:
-                f.write("因子分析详细报告\n")
-                f.write("=" * 100 + "\n")
-                f.write(f"分析时间范围: {START_DATE} 至 {END_DATE}\n")
-                test_stocks = analyzer.get_test_stocks()
-                f.write(f"测试股票数量: {len(test_stocks)}\n")
-                f.write(f"分析因子数量: {len(results)}\n")
-                f.write("=" * 100 + "\n\n")
+            # 先在内存中拼接完整报告，最后一次性写入文件
+            report_buffer = io.StringIO()
+            w = report_buffer.write
+            w("因子分析详细报告\n")
+            w("=" * 100 + "\n")
+            w(f"分析时间范围: {START_DATE} 至 {END_DATE}\n")
+            test_stocks = analyzer.get_test_stocks()
+            w(f"测试股票数量: {len(test_stocks)}\n")
+            w(f"分析因子数量: {len(results)}\n")
+            w("=" * 100 + "\n\n")
+            
+            # 写入按IC绝对值排序的汇总表
+            w("因子分析结果汇总 (按IC绝对值排序):\n")
+            w(summary_text + "\n\n")
+            
+            # 写入每个因子的详细信息
+            w("各因子详细信息:\n")
+            w("=" * 100 + "\n\n")
+            
+            for result in results_sorted:
+                w(f"因子名称: {result['factor_name']}\n")
+                w("-" * 50 + "\n")
                 
-                # 按IC绝对值排序后写入详细结果
-                results_sorted = sorted(results, key=lambda x: abs(x['mean_rank_ic']), reverse=True)
+                mean_ic = result['mean_rank_ic']
+                w(f"平均Rank IC: {'nan' if mean_ic is None else f'{mean_ic:.6f}'}\n")
                 
-                f.write("因子分析结果汇总 (按IC绝对值排序):\n")
-                f.write("-" * 90 + "\n")
-                f.write(f"{'因子名称':<25} {'平均Rank IC':<15} {'IC绝对值':<10} {'IR':<10} {'正相关比例':<15} {'有效天数':<10}\n")
-                f.write("-" * 90 + "\n")
+                ic_abs = result['abs_mean_rank_ic']
+                w(f"IC绝对值: {'nan' if ic_abs is None else f'{ic_abs:.6f}'}\n")
                 
-                for result in results_sorted:
-                    # 安全地格式化输出，处理可能的None或NaN值
-                    mean_ic = result['mean_rank_ic']
-                    ic_abs = abs(mean_ic) if mean_ic is not None else None
-                    ir = result['ir']
-                    positive_ratio = result['positive_ratio']
-                    
-                    # 使用条件判断格式化数值
-                    mean_ic_str = f"{mean_ic:<15.4f}" if mean_ic is not None else f"{'nan':<15}"
-                    ic_abs_str = f"{ic_abs:<10.4f}" if ic_abs is not None else f"{'nan':<10}"
-                    ir_str = f"{ir:<10.4f}" if ir is not None else f"{'nan':<10}"
-                    positive_ratio_str = f"{positive_ratio:<15.2%}" if positive_ratio is not None else f"{'nan':<15}"
-                    
-                    f.write(f"{result['factor_name']:<25} {mean_ic_str} {ic_abs_str} {ir_str} {positive_ratio_str} {result['total_days']:<10}\n")
+                ir = result['ir']
+                w(f"信息比率(IR): {'nan' if ir is None else f'{ir:.6f}'}\n")
                 
-                f.write("-" * 90 + "\n\n")
+                positive_ratio = result['positive_ratio']
+                w(f"正相关比例: {'nan' if positive_ratio is None else f'{positive_ratio:.2%}'}\n")
+                w(f"负相关比例: {'nan' if positive_ratio is None else f'{(1 - positive_ratio):.2%}'}\n")
                 
-                # 写入每个因子的详细信息
-                f.write("各因子详细信息:\n")
-                f.write("=" * 100 + "\n\n")
+                w(f"有效天数: {result['total_days']}\n")
+                w(f"总分析天数: {result['total_days']}\n")
                 
-                for result in results_sorted:
-                    f.write(f"因子名称: {result['factor_name']}\n")
-                    f.write("-" * 50 + "\n")
-                    
-                    mean_ic = result['mean_rank_ic']
-                    f.write(f"平均Rank IC: {'nan' if mean_ic is None else f'{mean_ic:.6f}'}\n")
-                    
-                    ic_abs = abs(mean_ic) if mean_ic is not None else None
-                    f.write(f"IC绝对值: {'nan' if ic_abs is None else f'{ic_abs:.6f}'}\n")
-                    
-                    ir = result['ir']
-                    f.write(f"信息比率(IR): {'nan' if ir is None else f'{ir:.6f}'}\n")
-                    
-                    positive_ratio = result['positive_ratio']
-                    f.write(f"正相关比例: {'nan' if positive_ratio is None else f'{positive_ratio:.2%}'}\n")
-                    f.write(f"负相关比例: {'nan' if positive_ratio is None else f'{(1 - positive_ratio):.2%}'}\n")
-                    
-                    f.write(f"有效天数: {result['total_days']}\n")
-                    f.write(f"总分析天数: {result['total_days']}\n")
-                    
-                    std_ic = result['std_rank_ic']
-                    f.write(f"IC标准差: {'nan' if std_ic is None else f'{std_ic:.6f}'}\n")
-                    
-                    # 提取Rank IC值列表
-                    rank_ics = result['rank_ic_data']['rank_ic'].dropna().tolist()
-                    if rank_ics:
-                        f.write(f"Rank IC最大值: {max(rank_ics):.6f}\n")
-                        f.write(f"Rank IC最小值: {min(rank_ics):.6f}\n")
-                        f.write(f"Rank IC中位数: {np.median(rank_ics):.6f}\n")
-                        f.write(f"Rank IC上四分位数: {np.percentile(rank_ics, 75):.6f}\n")
-                        f.write(f"Rank IC下四分位数: {np.percentile(rank_ics, 25):.6f}\n")
-                    
-                    f.write("\n")
+                # 提取有效的Rank IC值
+                rank_ics = result['rank_ic_data']['rank_ic'].to_numpy(dtype=np.float64)
+                rank_ics = rank_ics[~np.isnan(rank_ics)]
+                
+                std_ic = result['std_rank_ic']
+                w(f"IC标准差: {'nan' if std_ic is None else f'{std_ic:.6f}'}\n")
+                
+                if rank_ics.size:
+                    # 一次计算最小值、四分位数、中位数和最大值
+                    ic_min, ic_q25, ic_median, ic_q75, ic_max = np.quantile(rank_ics, [0.0, 0.25, 0.5, 0.75, 1.0])
+                    w(f"Rank IC最大值: {ic_max:.6f}\n")
+                    w(f"Rank IC最小值: {ic_min:.6f}\n")
+                    w(f"Rank IC中位数: {ic_median:.6f}\n")
+                    w(f"Rank IC上四分位数: {ic_q75:.6f}\n")
+                    w(f"Rank IC下四分位数: {ic_q25:.6f}\n")
                 
-                f.write("=" * 100 + "\n")
-                f.write("报告生成时间: " + datetime.now().strftime("%Y-%m-%d %H:%M:%S") + "\n")
-                f.write("=" * 100 + "\n")
+                w("\n")
+            
+            w("=" * 100 + "\n")
+            w("报告生成时间: " + report_time + "\n")
+            w("=" * 100 + "\n")
+            
+            with open(txt_path, 'w', encoding='utf-8') as f:
+                f.write(report_buffer.getvalue())
             
             logger.info(f"详细txt报告已保存到: {txt_path}")
             
@@ -1,6 +1,18 @@
 import sqlite3
 import os
 import json
+from urllib.request import pathname2url
+
+def approx_row_count(cursor, table):
+    """
+    估算表的行数：rowid表直接取最大rowid（无需全表扫描，删除或替换过记录时会偏大），
+    WITHOUT ROWID表回退到COUNT(*)
+    """
+    try:
+        cursor.execute(f'SELECT COALESCE(MAX(rowid), 0) FROM "{table}"')
+    except sqlite3.OperationalError:
+        cursor.execute(f'SELECT COUNT(*) FROM "{table}"')
+    return cursor.fetchone()[0]
 
 def check_database():
     """检查数据库内容"""
@@ -19,8 +31,15 @@ def check_database():
     print(f"数据库文件存在: {db_path}")
     
     try:
-        conn = sqlite3.connect(db_path)
+        # 以只读模式打开数据库，不获取写锁，并启用内存映射读取
+        conn = sqlite3.connect(f'file:{pathname2url(os.path.abspath(db_path))}?mode=ro', uri=True)
         cursor = conn.cursor()
+        try:
+            cursor.execute("PRAGMA mmap_size=268435456")
+            cursor.execute("PRAGMA cache_size=-65536")
+            cursor.execute("PRAGMA query_only=1")
+        except sqlite3.Error:
+            pass
         
         # 检查表名
         cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
@@ -30,9 +49,8 @@ def check_database():
             print(f"  - {table[0]}")
         
         # 检查daily_quotes表的数据量
-        cursor.execute("SELECT COUNT(*) FROM daily_quotes")
-        count = cursor.fetchone()[0]
-        print(f"\ndaily_quotes表中有 {count} 条记录")
+        count = approx_row_count(cursor, 'daily_quotes')
+        print(f"\ndaily_quotes表中约有 {count} 条记录")
         
         # 检查表结构
         cursor.execute("PRAGMA table_info(daily_quotes)")
@@ -50,9 +68,8 @@ def check_database():
                 print(row)
         
         # 检查factors表的数据量
-        cursor.execute("SELECT COUNT(*) FROM factors")
-        factor_count = cursor.fetchone()[0]
-        print(f"\nfactors表中有 {factor_count} 条记录")
+        factor_count = approx_row_count(cursor, 'factors')
+        print(f"\nfactors表中约有 {factor_count} 条记录")
         
         # 如果factors表有数据，查看前几条
         if factor_count > 0:
@@ -8,6 +8,7 @@ import os
 import sys
 import json
 import sqlite3
+from urllib.request import pathname2url
 
 # 添加项目根目录到Python路径
 project_root = os.path.dirname(os.path.abspath(__file__))
@@ -24,27 +25,57 @@ print(f"Trying to connect to database at: {db_path}")
 print(f"Database file exists: {os.path.exists(db_path)}")
 
 # 连接数据库
-conn = sqlite3.connect(db_path)
+# 以只读模式打开数据库，不获取写锁，并启用内存映射读取
+conn = sqlite3.connect(f'file:{pathname2url(os.path.abspath(db_path))}?mode=ro', uri=True)
 cursor = conn.cursor()
+try:
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.execute("PRAGMA query_only=1")
+except sqlite3.Error:
+    pass
 
 # 查看所有表
 print("数据库中的表:")
-cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
+cursor.execute("SELECT name, sql FROM sqlite_master WHERE type='table';")
 tables = cursor.fetchall()
-for table in tables:
-    print(f"- {table[0]}")
+
+# 一次查询取得所有表的结构（table_xinfo包含隐藏列）
+cursor.execute("""
+    SELECT m.name, c.name, c.type
+    FROM sqlite_master AS m JOIN pragma_table_xinfo(m.name) AS c
+    WHERE m.type = 'table'
+    ORDER BY m.name, c.cid;
+""")
+table_columns = {}
+for table_name, column_name, column_type in cursor.fetchall():
+    table_columns.setdefault(table_name, []).append((column_name, column_type))
+
+# 一次查询估算所有表的行数：rowid表取最大rowid（无需全表扫描，删除或替换过记录时会偏大），
+# WITHOUT ROWID表使用COUNT(*)
+count_queries = []
+for table_name, table_sql in tables:
+    if table_sql and 'WITHOUT ROWID' in table_sql.upper():
+        count_expr = "COUNT(*)"
+    else:
+        count_expr = "COALESCE(MAX(rowid), 0)"
+    count_queries.append(f"SELECT '{table_name}', {count_expr} FROM \"{table_name}\"")
+
+row_counts = {}
+if count_queries:
+    cursor.execute(" UNION ALL ".join(count_queries))
+    row_counts = dict(cursor.fetchall())
+
+for table_name, _ in tables:
+    print(f"- {table_name}")
     
     # 查看表结构
     print(f"  表结构:")
-    cursor.execute(f"PRAGMA table_info({table[0]});")
-    columns = cursor.fetchall()
-    for column in columns:
-        print(f"    - {column[1]} ({column[2]})")
+    for column_name, column_type in table_columns.get(table_name, []):
+        print(f"    - {column_name} ({column_type})")
     
     # 查看表中的数据行数
-    cursor.execute(f"SELECT COUNT(*) FROM {table[0]};")
-    count = cursor.fetchone()[0]
-    print(f"  数据行数: {count}")
+    print(f"  数据行数(约): {row_counts.get(table_name, 0)}")
     print()
 
 # 关闭数据库连接
@@ -9,6 +9,7 @@
 import os
 import sys
 import json
+import functools
 
 # 获取项目根目录
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -18,12 +19,18 @@ ROOT_DIR = PROJECT_ROOT
 from .directory_config import (
     BASE_DIRS, DATA_DIRS, REPORTS_DIRS, LOGS_DIRS, 
     FACTOR_RESULTS_DIRS, BACKTEST_RESULTS_DIRS,
-    get_full_path, create_all_directories
+    get_full_path, create_all_directories, ensure_directory, get_run_timestamp, set_run_timestamp, RUN_TIMESTAMP_ENV
 )
 
 # 从config.json加载配置
+@functools.lru_cache(maxsize=1)
 def load_config_json():
-    """从config.json加载配置"""
+    """
+    从config.json加载配置
+    
+    结果会被缓存，重复调用不再读取磁盘；运行期间修改了config.json时，
+    可调用load_config_json.cache_clear()后重新加载
+    """
     config_json_path = os.path.join(PROJECT_ROOT, 'config', 'config.json')
     if os.path.exists(config_json_path):
         with open(config_json_path, 'r', encoding='utf-8') as f:
@@ -36,32 +43,44 @@ config_json = load_config_json()
 # DATABASE_PATH: 股票数据库文件路径，优先从config.json加载，如不存在则使用默认路径
 DATABASE_PATH = config_json.get('DATABASE_PATH', os.path.join(DATA_DIRS['DATABASE'], 'data', 'sz50_stock_data.db'))
 
+# 公共日期范围配置，因子分析、因子计算和回测共用，可在config.json中覆盖
+START_DATE = config_json.get('START_DATE', "2015-01-01")  # 默认开始日期
+END_DATE = config_json.get('END_DATE', "2025-12-05")  # 默认结束日期
+
 # 因子分析配置
 FACTOR_ANALYSIS_CONFIG = {
     'TEST_SCOPE': 'SZ50',  # 测试范围：SZ50/HS300/ZZ500/ZZ1000/ZZ2000/INDIVIDUAL/ALL_A
     'INDIVIDUAL_STOCK': None,  # 单个股票代码 (仅当TEST_SCOPE为INDIVIDUAL时需要)
-    'START_DATE': "2015-01-01",  # 分析开始日期
-    'END_DATE': "2025-12-05",  # 分析结束日期
+    'START_DATE': START_DATE,  # 分析开始日期
+    'END_DATE': END_DATE,  # 分析结束日期
     'FORWARD_PERIOD': 20,  # 目标收益率计算周期（交易日数）
     'NORMALIZE_FACTOR': True,  # 是否进行因子横截面标准化（Z-score标准化）
     'GROUP_NUM': 10,  # 分组收益分析的分组数量
+    'USE_POLARS': False,  # 是否使用Polars计算Rank IC和分组收益（需安装polars，未安装时自动回退到pandas）
+    'USE_NUMBA': False,  # 是否使用Numba并行内核计算Rank IC（需安装numba，未安装时自动回退到pandas）
+    'FIGURE_DPI': 150,  # 分析图表保存分辨率
+    'USE_PARQUET_CACHE': False,  # 是否将因子和行情表缓存为Parquet文件加速读取（需安装pyarrow，数据库更新后自动重建）
+    'MAX_WORKERS': 1,  # 并行分析因子的进程数，1表示串行，None表示使用全部CPU核心
+    'SAVE_SUMMARY_CSV': True,  # 是否保存CSV格式的分析结果汇总（安装pyarrow时另存Parquet格式）
+    'CACHE_GROUP_RETURNS': False,  # 是否将每日分组收益率缓存到磁盘，参数和股票列表相同时重复运行直接读取（数据库更新后自动失效）
     'RESULT_DIR': get_full_path(FACTOR_RESULTS_DIRS['ANALYZED']),  # 分析结果保存目录
     'REPORT_DIR': get_full_path(REPORTS_DIRS['FACTOR_ANALYSIS'])  # 分析报告保存目录
 }
 
 # 因子计算配置
 FACTOR_CALCULATION_CONFIG = {
-    'START_DATE': "2015-01-01",  # 计算开始日期
-    'END_DATE': "2025-12-05",  # 计算结束日期
+    'START_DATE': START_DATE,  # 计算开始日期
+    'END_DATE': END_DATE,  # 计算结束日期
     'BATCH_SIZE': 100,  # 每批计算的股票数量（控制内存使用）
+    'USE_PARQUET_CACHE': False,  # 是否将加载的行情数据缓存为Parquet文件，重复运行时直接读取（需安装pyarrow，数据库更新后自动重建）
     'RESULT_DIR': get_full_path(FACTOR_RESULTS_DIRS['CALCULATED'])  # 因子计算结果保存目录
 }
 
 # 回测配置
 BACKTEST_CONFIG = {
     'STRATEGY': 'sma',  # 回测策略名称
-    'START_DATE': "2015-01-01",  # 回测开始日期
-    'END_DATE': "2025-12-05",  # 回测结束日期
+    'START_DATE': START_DATE,  # 回测开始日期
+    'END_DATE': END_DATE,  # 回测结束日期
     'INITIAL_CASH': 1000000,  # 初始资金（元）
     'COMMISSION': 0.0003,  # 交易佣金比例（0.03%）
     'SLIPPAGE': 0.001,  # 滑点比例（0.1%）
@@ -183,6 +202,7 @@ MULTI_FACTOR_COMBINATION_CONFIG = {
     },
     "TARGET_RETURN_DAYS": 20,  # 目标收益率预测周期（交易日数）
     "TRANSACTION_COST": 0.0015,  # 交易成本比例（0.15%）
+    "GROUP_RETURNS_FORMAT": "parquet",  # 分组收益数据保存格式：parquet(列式存储，需安装pyarrow，未安装时自动使用csv)/csv
     "RESULTS_PATH": os.path.join(ROOT_DIR, "results", "multi_factor_combination")  # 多因子组合分析结果保存路径
 }
 
@@ -196,9 +216,19 @@ PLOT_CONFIG = {
 }
 
 # 初始化函数
-def init_config():
-    """初始化配置，创建所有必要的目录"""
+def init_config(timestamp=None):
+    """
+    初始化配置：确定本次运行的时间戳，并创建所有必要的目录
+    
+    参数:
+        timestamp (str): 运行时间戳，默认使用当前时间
+    
+    返回:
+        str: 本次运行的时间戳
+    """
+    timestamp = set_run_timestamp(timestamp)
     create_all_directories()
+    return timestamp
 
 # 不再自动调用目录创建函数
 # create_all_directories()
@@ -208,11 +238,14 @@ __all__ = [
     # 目录配置
     'BASE_DIRS', 'DATA_DIRS', 'REPORTS_DIRS', 'LOGS_DIRS', 
     'FACTOR_RESULTS_DIRS', 'BACKTEST_RESULTS_DIRS',
-    'get_full_path', 'create_all_directories',
+    'get_full_path', 'create_all_directories', 'ensure_directory', 'get_run_timestamp', 'set_run_timestamp',
     
     # 数据库配置
     'DATABASE_PATH',
     
+    # 公共日期范围配置
+    'START_DATE', 'END_DATE',
+    
     # 因子分析配置
     'FACTOR_ANALYSIS_CONFIG',
     
@@ -61,6 +61,24 @@ BACKTEST_RESULTS_DIRS = {
     'PLOTS': os.path.join(BASE_DIRS['BACKTEST_RESULTS'], 'plots')
 }
 
+def ensure_directory(dir_path):
+    """
+    确保目录存在
+    
+    参数:
+        dir_path (str): 目录路径
+    
+    返回:
+        bool: 是否新创建了目录
+    """
+    if os.path.isdir(dir_path):
+        return False
+    os.makedirs(dir_path, exist_ok=True)
+    return True
+
+# 本次运行时间戳所使用的环境变量，子进程继承该变量以共享同一时间戳
+RUN_TIMESTAMP_ENV = 'FACTOR_ANALYZER_TIMESTAMP'
+
 # 为所有目录添加按日期的子目录
 def get_date_subdir():
     """获取当前日期的子目录名称，格式为YYYYMMDD"""
@@ -70,10 +88,36 @@ def get_datetime_subdir():
     """获取当前日期时间的子目录名称，格式为YYYYMMDD_HHMMSS"""
     return datetime.now().strftime('%Y%m%d_%H%M%S')
 
+def get_run_timestamp():
+    """
+    获取本次运行的时间戳，格式为YYYYMMDD_HHMMSS
+    
+    运行入口已通过set_run_timestamp设置时间戳时返回该时间戳（工作进程通过环境变量继承）；
+    未设置时返回当前时间，不写入环境变量，多次保存的文件不会因同名而互相覆盖
+    
+    返回:
+        str: 运行时间戳
+    """
+    return os.environ.get(RUN_TIMESTAMP_ENV) or get_datetime_subdir()
+
+def set_run_timestamp(timestamp=None):
+    """
+    在运行入口设置本次运行的时间戳，之后创建的工作进程继承同一时间戳
+    
+    参数:
+        timestamp (str): 运行时间戳，默认使用当前时间
+    
+    返回:
+        str: 本次运行的时间戳
+    """
+    timestamp = timestamp or get_datetime_subdir()
+    os.environ[RUN_TIMESTAMP_ENV] = timestamp
+    return timestamp
+
 # 带有日期子目录的完整路径
 def get_full_path(base_dir, with_datetime=False):
     """
-    获取带有日期或日期时间子目录的完整路径
+    获取带有日期或日期时间子目录的完整路径，日期时间子目录使用本次运行的时间戳
     
     参数:
         base_dir (str): 基础目录路径
@@ -83,7 +127,7 @@ def get_full_path(base_dir, with_datetime=False):
         str: 完整的路径
     """
     if with_datetime:
-        return os.path.join(base_dir, get_datetime_subdir())
+        return os.path.join(base_dir, get_run_timestamp())
     return os.path.join(base_dir, get_date_subdir())
 
 # 创建所有目录的函数
@@ -93,8 +137,8 @@ def create_all_directories():
     all_dirs = {**BASE_DIRS, **DATA_DIRS, **REPORTS_DIRS, **LOGS_DIRS, **FACTOR_RESULTS_DIRS, **BACKTEST_RESULTS_DIRS}
     
     for dir_path in all_dirs.values():
-        os.makedirs(dir_path, exist_ok=True)
-        print(f"已创建目录: {dir_path}")
+        if ensure_directory(dir_path):
+            print(f"已创建目录: {dir_path}")
 
 # 初始化函数
 # 只有当直接运行该文件时才创建目录，避免被导入时自动执行
@@ -7,15 +7,29 @@
 """
 
 import os
+import time
 import logging
+import multiprocessing
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
+from functools import lru_cache
 
 # 导入目录配置
-from .directory_config import LOGS_DIRS, get_date_subdir
+from .directory_config import LOGS_DIRS, ensure_directory
 
-# 创建日志目录（如果不存在）
-for dir_path in LOGS_DIRS.values():
-    os.makedirs(dir_path, exist_ok=True)
+@lru_cache(maxsize=1)
+def _time_parts(second):
+    """
+    按整秒缓存日志路径使用的日期和时间字符串，同一秒内创建多个日志记录器时只格式化一次
+    
+    参数:
+        second (int): 整数秒时间戳
+    
+    返回:
+        tuple: (YYYYMMDD, HHMMSS)
+    """
+    now = datetime.fromtimestamp(second)
+    return now.strftime('%Y%m%d'), now.strftime('%H%M%S')
 
 # 获取当前日期的日志目录
 def get_log_file_path(log_type):
@@ -31,11 +45,10 @@ def get_log_file_path(log_type):
     if log_type not in LOGS_DIRS:
         log_type = 'SYSTEM'  # 默认使用系统日志目录
     
-    date_subdir = get_date_subdir()
+    date_subdir, current_time = _time_parts(int(time.time()))
     log_dir = os.path.join(LOGS_DIRS[log_type], date_subdir)
-    os.makedirs(log_dir, exist_ok=True)
+    ensure_directory(log_dir)
     
-    current_time = datetime.now().strftime('%H%M%S')
     log_file = f"{log_type.lower()}_{current_time}.log"
     
     return os.path.join(log_dir, log_file)
@@ -43,6 +56,17 @@ def get_log_file_path(log_type):
 # 配置日志格式
 LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 
+# 该环境变量记录启动日志队列监听器的主进程号，之后启动的子进程经队列由主进程统一写日志，不打开日志文件
+QUEUE_LOGGING_ENV = 'FACTOR_QUEUE_LOGGING_PID'
+
+def _is_queue_logging_worker():
+    """
+    判断当前进程是否为经日志队列写日志的工作进程
+    spawn方式启动的子进程在导入模块时尚未记录父进程，因此按进程号与主进程区分
+    """
+    listener_pid = os.environ.get(QUEUE_LOGGING_ENV)
+    return bool(listener_pid) and listener_pid != str(os.getpid())
+
 # 创建不同类型的日志记录器
 def create_logger(name, log_type='SYSTEM', level=logging.INFO):
     """
@@ -59,8 +83,8 @@ def create_logger(name, log_type='SYSTEM', level=logging.INFO):
     logger = logging.getLogger(name)
     logger.setLevel(level)
     
-    # 避免重复添加处理器
-    if not logger.handlers:
+    # 避免重复添加处理器；工作进程的处理器由use_queue_handler设置，不创建日志文件
+    if not logger.handlers and not _is_queue_logging_worker():
         # 创建文件处理器
         log_file = get_log_file_path(log_type)
         file_handler = logging.FileHandler(log_file, encoding='utf-8')
@@ -78,12 +102,71 @@ def create_logger(name, log_type='SYSTEM', level=logging.INFO):
     
     return logger
 
-# 预定义的日志记录器
-data_logger = create_logger('data', 'DATA_FETCHING')
-factor_calculation_logger = create_logger('factor_calculation', 'FACTOR_CALCULATION')
-factor_analysis_logger = create_logger('factor_analysis', 'FACTOR_ANALYSIS')
-backtest_logger = create_logger('backtest', 'BACKTEST')
-system_logger = create_logger('system', 'SYSTEM')
+def start_queue_listener(logger):
+    """
+    在主进程中启动日志队列监听器，工作进程的日志记录经队列交给主进程现有的处理器统一写出，
+    所有进程共用主进程打开的日志文件；之后启动的工作进程导入模块时不再打开自己的日志文件
+    
+    参数:
+        logger (logging.Logger): 主进程中已配置好的日志记录器
+    
+    返回:
+        tuple: (日志队列, QueueListener)，使用完毕后调用stop_queue_listener
+    """
+    log_queue = multiprocessing.Queue()
+    listener = QueueListener(log_queue, *logger.handlers, respect_handler_level=True)
+    listener.start()
+    os.environ[QUEUE_LOGGING_ENV] = str(os.getpid())
+    return log_queue, listener
+
+def stop_queue_listener(listener):
+    """
+    停止日志队列监听器，之后启动的子进程恢复自行写日志文件
+    
+    参数:
+        listener: start_queue_listener返回的QueueListener
+    """
+    os.environ.pop(QUEUE_LOGGING_ENV, None)
+    listener.stop()
+
+def use_queue_handler(logger, log_queue):
+    """
+    在工作进程中将日志记录器的处理器替换为QueueHandler，不再自行写日志文件
+    
+    参数:
+        logger (logging.Logger): 工作进程中的日志记录器
+        log_queue: start_queue_listener返回的日志队列
+    """
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+    logger.addHandler(QueueHandler(log_queue))
+
+# 预定义的日志记录器：(名称, 日志类型)
+# 首次访问时才创建，导入本模块不会为未使用的日志记录器创建目录和打开日志文件
+_PREDEFINED_LOGGERS = {
+    'data_logger': ('data', 'DATA_FETCHING'),
+    'factor_calculation_logger': ('factor_calculation', 'FACTOR_CALCULATION'),
+    'factor_analysis_logger': ('factor_analysis', 'FACTOR_ANALYSIS'),
+    'backtest_logger': ('backtest', 'BACKTEST'),
+    'system_logger': ('system', 'SYSTEM')
+}
+
+def __getattr__(name):
+    """
+    按需创建预定义的日志记录器（PEP 562模块级__getattr__），创建后缓存为模块属性
+    
+    参数:
+        name (str): 属性名称，如system_logger
+    
+    返回:
+        logging.Logger: 配置好的日志记录器
+    """
+    if name in _PREDEFINED_LOGGERS:
+        logger = create_logger(*_PREDEFINED_LOGGERS[name])
+        globals()[name] = logger
+        return logger
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # 兼容旧的get_logger接口
 def get_logger(name, log_type='SYSTEM', level=logging.INFO):
@@ -2,6 +2,7 @@ import pandas as pd
 import sqlite3
 from abc import ABC, abstractmethod
 from tqdm import tqdm
+from itertools import repeat
 
 class Factor(ABC):
     """
@@ -47,6 +48,30 @@ class Factor(ABC):
         """
         pass
     
+    @staticmethod
+    def _sort_by_stock_date(df):
+        """
+        按股票代码和交易日期排序；数据已有序时（load_stock_data按此顺序返回）直接返回，不再复制整表
+        
+        Parameters:
+            df: pd.DataFrame, 包含ts_code和trade_date列的数据
+            
+        Returns:
+            pd.DataFrame: 排序后的数据
+        """
+        codes = df['ts_code'].to_numpy()
+        dates = df['trade_date'].to_numpy()
+        if len(df) < 2:
+            return df
+        try:
+            same_code = codes[1:] == codes[:-1]
+            is_sorted = ((codes[1:] > codes[:-1]) | (same_code & (dates[1:] >= dates[:-1]))).all()
+        except TypeError:
+            is_sorted = False
+        if is_sorted:
+            return df
+        return df.sort_values(['ts_code', 'trade_date'])
+    
     def store_to_db(self, conn):
         """
         将因子值存储到数据库（存储前会进行数据清洗）
@@ -73,32 +98,11 @@ class Factor(ABC):
             
             # 创建因子表（如果不存在）
             cursor = conn.cursor()
-            cursor.execute(f"""
-                CREATE TABLE IF NOT EXISTS {self.factor_table} (
-                    ts_code TEXT,
-                    trade_date TEXT,
-                    factor_name TEXT,
-                    factor_value REAL,
-                    PRIMARY KEY (ts_code, trade_date, factor_name)
-                )
-            """)
+            self._create_table(cursor)
             conn.commit()
             
             # 存储因子值
-            data_to_insert = []
-            for _, row in cleaned_data.iterrows():
-                data_to_insert.append((
-                    row['ts_code'],
-                    row['trade_date'],
-                    self.name,
-                    row[self.name]
-                ))
-            
-            cursor.executemany(f"""
-                INSERT OR REPLACE INTO {self.factor_table} 
-                (ts_code, trade_date, factor_name, factor_value)
-                VALUES (?, ?, ?, ?)
-            """, data_to_insert)
+            self._insert_records(cursor, self.to_records(cleaned_data, [self.name]))
             conn.commit()
             
             print(f"因子 {self.name} 已存储到数据库")
@@ -107,6 +111,61 @@ class Factor(ABC):
             print(f"存储因子 {self.name} 到数据库错误: {e}")
             return False
     
+    def _create_table(self, cursor):
+        """
+        创建因子表及按因子名称和日期查询的索引（如果不存在）
+        
+        Parameters:
+            cursor: sqlite3.Cursor, 数据库游标
+        """
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.factor_table} (
+                ts_code TEXT,
+                trade_date TEXT,
+                factor_name TEXT,
+                factor_value REAL,
+                PRIMARY KEY (ts_code, trade_date, factor_name)
+            )
+        """)
+        # 主键以ts_code开头，按因子名称和日期范围查询时无法使用，单独建立索引
+        cursor.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_{self.factor_table}_name_date
+            ON {self.factor_table} (factor_name, trade_date)
+        """)
+    
+    def _insert_records(self, cursor, records):
+        """
+        批量写入因子记录
+        
+        Parameters:
+            cursor: sqlite3.Cursor, 数据库游标
+            records: iterable, (ts_code, trade_date, factor_name, factor_value)元组
+        """
+        cursor.executemany(f"""
+            INSERT OR REPLACE INTO {self.factor_table} 
+            (ts_code, trade_date, factor_name, factor_value)
+            VALUES (?, ?, ?, ?)
+        """, records)
+    
+    @staticmethod
+    def to_records(cleaned_data, value_columns):
+        """
+        将清洗后的因子数据转换为数据库记录，按列整体转换为Python对象后组装，不逐行构造Series
+        
+        Parameters:
+            cleaned_data: pd.DataFrame, 清洗后的因子数据
+            value_columns: list, 需要存储的因子值列，列名即存储的因子名称
+            
+        Returns:
+            list: (ts_code, trade_date, factor_name, factor_value)元组列表
+        """
+        ts_codes = cleaned_data['ts_code'].tolist()
+        trade_dates = cleaned_data['trade_date'].tolist()
+        records = []
+        for col in value_columns:
+            records.extend(zip(ts_codes, trade_dates, repeat(col), cleaned_data[col].tolist()))
+        return records
+    
     def load_from_db(self, conn, ts_code=None, start_date=None, end_date=None):
         """
         从数据库加载因子值
@@ -154,8 +213,38 @@ class Factor(ABC):
             return None
 
 
+import copy
 import multiprocessing
-from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+# 工作进程中的原始股票数据，由进程池初始化函数设置
+_worker_data = None
+
+
+def _init_worker(data):
+    """
+    工作进程初始化函数，每个工作进程只接收一次原始股票数据
+    
+    Parameters:
+        data: pd.DataFrame, 原始股票数据
+    """
+    global _worker_data
+    _worker_data = data
+
+
+def _calculate_factor(factor):
+    """
+    在工作进程中计算单个因子（模块级函数，提交任务时只需序列化因子对象）
+    
+    Parameters:
+        factor: Factor, 因子对象
+        
+    Returns:
+        pd.DataFrame: 因子计算结果
+    """
+    return factor.calculate(_worker_data)
+
 
 class FactorManager:
     """
@@ -218,24 +307,32 @@ class FactorManager:
         
         if self.use_parallel:
             # 使用并行计算
-            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            # 原始数据通过初始化函数在每个工作进程中只传递一次，而不是随每个任务重复序列化
+            with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                     initargs=(data,)) as executor:
                 # 提交所有因子计算任务
-                future_to_factor = {
-                    executor.submit(factor.calculate, data.copy()): factor 
-                    for factor in self.factors
-                }
+                # 只传递不含上次计算结果的因子副本，避免把旧的因子数据一并发送
+                future_to_factor = {}
+                for factor in self.factors:
+                    task_factor = copy.copy(factor)
+                    task_factor.data = None
+                    future_to_factor[executor.submit(_calculate_factor, task_factor)] = factor
                 
-                # 获取计算结果
-                for future in tqdm(future_to_factor, desc="计算因子"):
+                # 按完成顺序获取计算结果，耗时长的因子不会阻塞其他结果的处理
+                completed = {}
+                for future in tqdm(as_completed(future_to_factor), total=len(future_to_factor), desc="计算因子"):
                     factor = future_to_factor[future]
                     try:
                         result = future.result()
                         if result is not None and not result.empty:
-                            results.append(result)
+                            completed[future] = result
                             factor.data = result  # 保存计算结果到因子对象
                             print(f"因子 {factor.name} 计算完成")
                     except Exception as e:
                         print(f"计算因子 {factor.name} 出错: {e}")
+                
+                # 结果列表仍按因子添加顺序返回
+                results = [completed[future] for future in future_to_factor if future in completed]
         else:
             # 串行计算
             for factor in tqdm(self.factors, desc="计算因子"):
@@ -268,22 +365,15 @@ class FactorManager:
             
             # 创建因子表（如果不存在）
             cursor = conn.cursor()
-            cursor.execute(f"""
-                CREATE TABLE IF NOT EXISTS {self.factors[0].factor_table} (
-                    ts_code TEXT,
-                    trade_date TEXT,
-                    factor_name TEXT,
-                    factor_value REAL,
-                    PRIMARY KEY (ts_code, trade_date, factor_name)
-                )
-            """)
+            self.factors[0]._create_table(cursor)
             conn.commit()
             
-            # 批量收集所有因子数据
-            all_data_to_insert = []
+            # 逐个因子准备记录后立即写入（同一事务内，最后统一提交），
+            # 内存中只保留当前因子的记录，而不是所有因子的记录
+            inserted_count = 0
             error_factors = []
             
-            for factor in tqdm(self.factors, desc="准备存储数据"):
+            for factor in tqdm(self.factors, desc="存储因子数据"):
                 try:
                     if factor.data is None or factor.data.empty:
                         continue
@@ -297,35 +387,25 @@ class FactorManager:
                     # 获取所有因子值列（排除ts_code和trade_date）
                     factor_value_columns = [col for col in cleaned_data.columns if col not in ['ts_code', 'trade_date']]
                     
-                    for _, row in cleaned_data.iterrows():
-                        for col in factor_value_columns:
-                            # 使用列名作为因子名称，例如：bb_20_2_width, bb_20_2_percent
-                            all_data_to_insert.append((
-                                row['ts_code'],
-                                row['trade_date'],
-                                col,
-                                row[col]
-                            ))
+                    # 使用列名作为因子名称，例如：bb_20_2_width, bb_20_2_percent
+                    records = Factor.to_records(cleaned_data, factor_value_columns)
                 except Exception as e:
                     print(f"处理因子 {factor.name} 时出错: {e}")
                     error_factors.append(factor.name)
+                    continue
+                
+                self.factors[0]._insert_records(cursor, records)
+                inserted_count += len(records)
             
             if error_factors:
                 print(f"以下因子处理出错: {error_factors}")
             
-            if not all_data_to_insert:
+            if not inserted_count:
                 print("没有数据需要存储")
                 return 0
             
-            # 批量插入数据
-            print(f"开始批量插入 {len(all_data_to_insert)} 条数据")
-            cursor.executemany(f"""
-                INSERT OR REPLACE INTO {self.factors[0].factor_table} 
-                (ts_code, trade_date, factor_name, factor_value)
-                VALUES (?, ?, ?, ?)
-            """, all_data_to_insert)
             conn.commit()
-            
+            print(f"已批量插入 {inserted_count} 条数据")
             print(f"所有因子已批量存储到数据库")
             return len(self.factors)
         except Exception as e:
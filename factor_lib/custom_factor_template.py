@@ -51,7 +51,7 @@ class KDJ_J_Factor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close', 'high', 'low']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算KDJ指标
         results = []
@@ -125,7 +125,7 @@ class MACD_DIFF_Factor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算MACD指标
         results = []
@@ -187,12 +187,21 @@ class CustomMomentumFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算动量因子
-        df[self.name] = df.groupby('ts_code')['close'].transform(
-            lambda x: (x - x.shift(self.window)) / x.shift(self.window)
-        )
+        # 数据已按股票代码和日期排序，window行之前属于同一股票时即为该股票window天前的价格，
+        # 直接在NumPy数组上整体计算，不再逐个股票调用lambda
+        close = df['close'].to_numpy(dtype=np.float64)
+        codes = df['ts_code'].to_numpy()
+        momentum = np.full(len(close), np.nan)
+        if len(close) > self.window:
+            prev_close = close[:-self.window]
+            same_stock = codes[self.window:] == codes[:-self.window]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                np.divide(close[self.window:] - prev_close, prev_close,
+                          out=momentum[self.window:], where=same_stock)
+        df[self.name] = momentum
         
         df = df[['ts_code', 'trade_date', self.name]]
         self.data = df
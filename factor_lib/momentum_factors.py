@@ -38,7 +38,7 @@ class MomentumFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算动量因子
         df[self.name] = df.groupby('ts_code')['close'].transform(
@@ -85,7 +85,7 @@ class RSIFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算RSI指标
         results = []
@@ -146,7 +146,7 @@ class MACDFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算MACD指标
         results = []
@@ -215,7 +215,7 @@ class RateOfChangeFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算变化率
         results = []
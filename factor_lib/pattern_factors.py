@@ -38,7 +38,7 @@ class DoubleBottomFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close', 'high', 'low']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 初始化因子值
         df[self.name] = 0
@@ -125,7 +125,7 @@ class DoubleTopFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close', 'high', 'low']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 初始化因子值
         df[self.name] = 0
@@ -212,7 +212,7 @@ class HeadShoulderBottomFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close', 'high', 'low']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 初始化因子值
         df[self.name] = 0
@@ -304,7 +304,7 @@ class HeadShoulderTopFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close', 'high', 'low']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 初始化因子值
         df[self.name] = 0
@@ -396,7 +396,7 @@ class TripleBottomFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close', 'high', 'low']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 初始化因子值
         df[self.name] = 0
@@ -477,7 +477,7 @@ class TripleTopFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close', 'high', 'low']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 初始化因子值
         df[self.name] = 0
@@ -558,7 +558,7 @@ class RoundBottomFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close', 'high', 'low']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 初始化因子值
         df[self.name] = 0
@@ -669,7 +669,7 @@ class RoundTopFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close', 'high', 'low']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 初始化因子值
         df[self.name] = 0
@@ -755,7 +755,7 @@ class VBottomFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close', 'high', 'low']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 初始化因子值
         df[self.name] = 0
@@ -835,7 +835,7 @@ class VTopFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close', 'high', 'low']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 初始化因子值
         df[self.name] = 0
@@ -915,7 +915,7 @@ class AscendingTriangleFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close', 'high', 'low']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 初始化因子值
         df[self.name] = 0
@@ -998,7 +998,7 @@ class DescendingTriangleFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close', 'high', 'low']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 初始化因子值
         df[self.name] = 0
@@ -1081,7 +1081,7 @@ class SymmetricalTriangleFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close', 'high', 'low']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 初始化因子值
         df[self.name] = 0
@@ -1165,7 +1165,7 @@ class AscendingWedgeFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close', 'high', 'low']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 初始化因子值
         df[self.name] = 0
@@ -1253,7 +1253,7 @@ class DescendingWedgeFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close', 'high', 'low']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 初始化因子值
         df[self.name] = 0
@@ -1341,7 +1341,7 @@ class RectanglePatternFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close', 'high', 'low']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 初始化因子值
         df[self.name] = 0
@@ -1419,7 +1419,7 @@ class GapPatternFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'open', 'high', 'low', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 初始化因子值
         df[self.name] = 0
@@ -1472,7 +1472,7 @@ class HammerPatternFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'open', 'high', 'low', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算实体大小和位置
         df['body_size'] = abs(df['close'] - df['open'])
@@ -1526,7 +1526,7 @@ class ShootingStarPatternFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'open', 'high', 'low', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算实体大小和位置
         df['body_size'] = abs(df['close'] - df['open'])
@@ -1580,7 +1580,7 @@ class MorningStarPatternFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'open', 'high', 'low', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 初始化因子值
         df[self.name] = 0
@@ -1652,7 +1652,7 @@ class EveningStarPatternFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'open', 'high', 'low', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 初始化因子值
         df[self.name] = 0
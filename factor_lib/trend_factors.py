@@ -1,8 +1,27 @@
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from .base import Factor
 
 
+def _rolling_mean_deviation(values, window):
+    """
+    计算滚动平均绝对偏差（CCI使用），所有窗口在NumPy中一次计算，不再逐个窗口调用Python函数
+    
+    参数:
+        values: np.ndarray, 典型价格序列
+        window: int, 窗口长度
+        
+    返回:
+        np.ndarray: 与values等长的平均偏差，前window-1个值及包含缺失值的窗口为NaN
+    """
+    result = np.full(len(values), np.nan)
+    if len(values) >= window:
+        windows = sliding_window_view(values, window)
+        result[window - 1:] = np.abs(windows - windows.mean(axis=1, keepdims=True)).mean(axis=1)
+    return result
+
+
 
 
 
@@ -18,7 +37,7 @@ class MACDFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算MACD
         for ts_code, group in df.groupby('ts_code'):
@@ -46,7 +65,7 @@ class MACD_SignalFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算MACD信号线
         for ts_code, group in df.groupby('ts_code'):
@@ -78,7 +97,7 @@ class RSI14Factor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算RSI
         def rsi(series, window=14):
@@ -113,7 +132,7 @@ class RSI21Factor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算RSI
         def rsi(series, window=21):
@@ -147,7 +166,7 @@ class ADXFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'high', 'low', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算ADX
         for ts_code, group in df.groupby('ts_code'):
@@ -194,7 +213,7 @@ class ATRFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'high', 'low', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算ATR
         for ts_code, group in df.groupby('ts_code'):
@@ -234,7 +253,7 @@ class CCI14Factor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'high', 'low', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算CCI
         for ts_code, group in df.groupby('ts_code'):
@@ -243,7 +262,7 @@ class CCI14Factor(Factor):
             # 计算移动平均典型价格
             tp_ma = tp.rolling(window=self.window).mean()
             # 计算平均偏差
-            mean_dev = tp.rolling(window=self.window).apply(lambda x: np.mean(np.abs(x - x.mean())))
+            mean_dev = _rolling_mean_deviation(tp.to_numpy(), self.window)
             # 计算CCI
             cci = (tp - tp_ma) / (0.015 * mean_dev)
             
@@ -265,7 +284,7 @@ class DMAFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算DMA
         for ts_code, group in df.groupby('ts_code'):
@@ -299,7 +318,7 @@ class RSI28Factor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算RSI
         def rsi(series, window=28):
@@ -333,7 +352,7 @@ class ADX20Factor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'high', 'low', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算ADX
         for ts_code, group in df.groupby('ts_code'):
@@ -380,7 +399,7 @@ class ADX28Factor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'high', 'low', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算ADX
         for ts_code, group in df.groupby('ts_code'):
@@ -427,7 +446,7 @@ class ATR7Factor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'high', 'low', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算ATR
         for ts_code, group in df.groupby('ts_code'):
@@ -463,7 +482,7 @@ class ATR20Factor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'high', 'low', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算ATR
         for ts_code, group in df.groupby('ts_code'):
@@ -499,7 +518,7 @@ class CCI7Factor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'high', 'low', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算CCI
         for ts_code, group in df.groupby('ts_code'):
@@ -508,7 +527,7 @@ class CCI7Factor(Factor):
             # 计算移动平均典型价格
             tp_ma = tp.rolling(window=self.window).mean()
             # 计算平均偏差
-            mean_dev = tp.rolling(window=self.window).apply(lambda x: np.mean(np.abs(x - x.mean())))
+            mean_dev = _rolling_mean_deviation(tp.to_numpy(), self.window)
             # 计算CCI
             cci = (tp - tp_ma) / (0.015 * mean_dev)
             
@@ -531,7 +550,7 @@ class CCI21Factor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'high', 'low', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算CCI
         for ts_code, group in df.groupby('ts_code'):
@@ -540,7 +559,7 @@ class CCI21Factor(Factor):
             # 计算移动平均典型价格
             tp_ma = tp.rolling(window=self.window).mean()
             # 计算平均偏差
-            mean_dev = tp.rolling(window=self.window).apply(lambda x: np.mean(np.abs(x - x.mean())))
+            mean_dev = _rolling_mean_deviation(tp.to_numpy(), self.window)
             # 计算CCI
             cci = (tp - tp_ma) / (0.015 * mean_dev)
             
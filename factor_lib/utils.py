@@ -4,11 +4,16 @@ import os
 import sys
 import logging
 import time
+import hashlib
 from datetime import datetime
 import json
 
 # 导入项目的日志配置
 from config.logger_config import system_logger as logger
+from config.config import load_config_json
+
+# 行情数值列的读取类型：在读取时直接转换为float64，避免整数与NULL混存时得到int64或object列
+STOCK_DATA_DTYPES = {col: 'float64' for col in ('open', 'high', 'low', 'close', 'vol', 'amount')}
 
 def get_database_connection(config_file=None):
     """
@@ -26,13 +31,12 @@ def get_database_connection(config_file=None):
         # 获取项目根目录
         project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         
-        # 如果没有提供配置文件路径，使用默认路径
+        # 读取配置文件：未指定时使用项目配置（进程内只解析一次）
         if config_file is None:
-            config_file = os.path.join(project_root, 'config', 'config.json')
-        
-        # 读取配置文件
-        with open(config_file, 'r') as f:
-            config = json.load(f)
+            config = load_config_json()
+        else:
+            with open(config_file, 'r') as f:
+                config = json.load(f)
         
         db_path = config.get('DATABASE_PATH', 'data/data/stock_data.db')
         
@@ -42,8 +46,8 @@ def get_database_connection(config_file=None):
         
         # 创建数据库目录（如果不存在）
         db_dir = os.path.dirname(db_path)
-        if db_dir and not os.path.exists(db_dir):
-            os.makedirs(db_dir)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
         
         # 连接数据库
         conn = sqlite3.connect(db_path)
@@ -54,7 +58,40 @@ def get_database_connection(config_file=None):
         logger.error(f"连接数据库失败: {str(e)}")
         return None
 
-def load_stock_data(conn, table_name='daily_quotes', ts_codes=None, start_date=None, end_date=None):
+def _get_stock_data_cache_path(conn, query, cache_dir):
+    """
+    获取股票数据查询的Parquet缓存路径，缓存文件按数据库路径和查询语句命名
+    
+    参数:
+        conn: 数据库连接对象
+        query: 查询语句
+        cache_dir: 缓存目录
+        
+    返回:
+        tuple: (缓存文件路径, 数据库修改时间, 缓存是否有效)，内存数据库返回(None, None, False)
+    """
+    db_file = conn.execute("PRAGMA database_list").fetchone()[2]
+    if not db_file or not os.path.exists(db_file):
+        return None, None, False
+    
+    # 查询语句不包含数据库信息，不同数据库的相同查询使用不同的缓存文件
+    cache_key = f"{os.path.abspath(db_file)}\n{query}"
+    query_hash = hashlib.md5(cache_key.encode('utf-8')).hexdigest()
+    cache_path = os.path.join(cache_dir, f"stock_data_{query_hash}.parquet")
+    db_mtime = repr(os.path.getmtime(db_file)).encode('utf-8')
+    
+    # 缓存文件元数据记录写入时数据库的修改时间，与当前数据库完全一致时缓存才有效
+    is_valid = False
+    if os.path.exists(cache_path):
+        try:
+            import pyarrow.parquet as pq
+            metadata = pq.read_schema(cache_path).metadata or {}
+            is_valid = metadata.get(b'db_mtime') == db_mtime
+        except Exception as e:
+            logger.warning(f"读取股票数据缓存信息失败: {str(e)}")
+    return cache_path, db_mtime, is_valid
+
+def load_stock_data(conn, table_name='daily_quotes', ts_codes=None, start_date=None, end_date=None, cache_dir=None):
     """
     从数据库加载股票数据
     
@@ -64,6 +101,7 @@ def load_stock_data(conn, table_name='daily_quotes', ts_codes=None, start_date=N
         ts_codes: 股票代码列表（可选）
         start_date: 开始日期（可选）
         end_date: 结束日期（可选）
+        cache_dir: Parquet缓存目录（可选，需安装pyarrow），相同查询重复运行时直接读取缓存，数据库更新后自动失效
         
     返回:
         pandas.DataFrame: 股票数据
@@ -88,8 +126,35 @@ def load_stock_data(conn, table_name='daily_quotes', ts_codes=None, start_date=N
         if conditions:
             query += " WHERE " + " AND ".join(conditions)
         
-        df = pd.read_sql_query(query, conn)
+        # 按股票代码和日期返回，因子计算时无需再逐个排序
+        query += " ORDER BY ts_code, trade_date"
+        
+        cache_path = None
+        if cache_dir:
+            cache_path, db_mtime, is_valid = _get_stock_data_cache_path(conn, query, cache_dir)
+            if is_valid:
+                df = pd.read_parquet(cache_path)
+                logger.info(f"从缓存加载 {len(df)} 条股票数据: {cache_path}")
+                return df
+        
+        # 只对表中存在的数值列指定类型
+        table_columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table_name})")}
+        dtype = {col: col_type for col, col_type in STOCK_DATA_DTYPES.items() if col in table_columns}
+        
+        df = pd.read_sql_query(query, conn, dtype=dtype or None)
         logger.info(f"成功加载 {len(df)} 条股票数据")
+        
+        if cache_path:
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+                os.makedirs(cache_dir, exist_ok=True)
+                # 在文件元数据中记录查询前数据库的修改时间，数据库之后被修改时缓存失效
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                table = table.replace_schema_metadata({**(table.schema.metadata or {}), b'db_mtime': db_mtime})
+                pq.write_table(table, cache_path)
+            except Exception as e:
+                logger.warning(f"写入股票数据缓存失败: {str(e)}")
         return df
     
     except Exception as e:
@@ -190,8 +255,9 @@ def clean_factor_data(data, factor_name):
     if not validate_factor_data(data):
         return None
     
-    # 移除重复数据
-    df = data.drop_duplicates(subset=['ts_code', 'trade_date'], keep='last')
+    # 移除重复数据：只按(ts_code, trade_date)键判断重复，没有重复时不复制数据
+    duplicated = data.duplicated(subset=['ts_code', 'trade_date'], keep='last')
+    df = data[~duplicated] if duplicated.any() else data
     
     # 移除缺失值
     original_count = len(df)
@@ -217,6 +283,9 @@ def clean_factor_data(data, factor_name):
     
     return df
 
+# 因子表名中需要替换为下划线的字符，一次translate完成全部替换
+_TABLE_NAME_TRANSLATION = str.maketrans({' ': '_', '.': '_'})
+
 def get_factor_table_name(factor_name):
     """
     获取因子表名
@@ -227,7 +296,7 @@ def get_factor_table_name(factor_name):
     返回:
         str: 表名
     """
-    return f"factor_{factor_name.lower().replace(' ', '_').replace('.', '_')}"
+    return f"factor_{factor_name.lower().translate(_TABLE_NAME_TRANSLATION)}"
 
 def create_factor_table(conn, factor_name, df):
     """
@@ -34,7 +34,7 @@ class DailyReturnFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算日收益率
         df[self.name] = df.groupby('ts_code')['close'].pct_change()
@@ -114,7 +114,7 @@ class VolatilityFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算日收益率
         df['daily_return'] = df.groupby('ts_code')['close'].pct_change()
@@ -163,7 +163,7 @@ class DownsideRiskFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算日收益率
         df['daily_return'] = df.groupby('ts_code')['close'].pct_change()
@@ -218,7 +218,7 @@ class MaximumDrawdownFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算最大回撤
         def calc_max_drawdown(x):
@@ -271,7 +271,7 @@ class SharpeRatioFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算日收益率
         df['daily_return'] = df.groupby('ts_code')['close'].pct_change()
@@ -333,7 +333,7 @@ class SkewnessFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算日收益率
         df['daily_return'] = df.groupby('ts_code')['close'].pct_change()
@@ -410,7 +410,7 @@ class KurtosisFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算日收益率
         df['daily_return'] = df.groupby('ts_code')['close'].pct_change()
@@ -483,7 +483,7 @@ class TrueRangeFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'high', 'low', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算前一日收盘价
         df['prev_close'] = df.groupby('ts_code')['close'].shift(1)
@@ -536,7 +536,7 @@ class AverageTrueRangeFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'high', 'low', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算真实波幅
         df['prev_close'] = df.groupby('ts_code')['close'].shift(1)
@@ -598,10 +598,17 @@ class HistoricalVolatilityFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算对数收益率
-        df['log_return'] = df.groupby('ts_code')['close'].transform(lambda x: np.log(x / x.shift(1)))
+        # 数据已按股票代码和日期排序，前一行属于同一股票时即为前一交易日收盘价，直接在NumPy数组上整体计算
+        close = df['close'].to_numpy(dtype=np.float64)
+        codes = df['ts_code'].to_numpy()
+        log_return = np.full(len(close), np.nan)
+        if len(close) > 1:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                np.log(close[1:] / close[:-1], out=log_return[1:], where=codes[1:] == codes[:-1])
+        df['log_return'] = log_return
         
         # 计算历史波动率
         df[self.name] = df.groupby('ts_code')['log_return'].transform(
@@ -651,7 +658,7 @@ class ParkinsonVolatilityFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'high', 'low']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算ln(Hi/Li)^2
         df['ln_hl'] = np.log(df['high'] / df['low']) ** 2
@@ -708,7 +715,7 @@ class BollingerBandsFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'close']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算布林带
         rolling_mean = df.groupby('ts_code')['close'].transform(lambda x: x.rolling(window=self.window).mean())
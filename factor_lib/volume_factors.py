@@ -108,7 +108,7 @@ class AmountChangeRateFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'amount']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算成交额变化率
         df[self.name] = df.groupby('ts_code')['amount'].pct_change(periods=self.window)
@@ -154,7 +154,7 @@ class VolumeMeanFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'vol']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算成交量均值
         df[self.name] = df.groupby('ts_code')['vol'].transform(
@@ -203,7 +203,7 @@ class VolumeToMeanFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'vol']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算成交量均值
         volume_mean = df.groupby('ts_code')['vol'].transform(
@@ -251,7 +251,7 @@ class VolumeAmplitudeFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'vol']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算成交量振幅
         volume_max = df.groupby('ts_code')['vol'].transform(
@@ -301,7 +301,7 @@ class VolumeAccumulationFactor(Factor):
             return None
         
         df = data[['ts_code', 'trade_date', 'vol']].copy()
-        df = df.sort_values(['ts_code', 'trade_date'])
+        df = self._sort_by_stock_date(df)
         
         # 计算成交量累积
         df[self.name] = df.groupby('ts_code')['vol'].transform(
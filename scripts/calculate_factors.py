@@ -26,7 +26,7 @@ from factor_lib import (
 
 # 设置日志
 from config.logger_config import factor_calculation_logger
-from config.config import FACTOR_CALCULATION_CONFIG, get_full_path
+from config.config import FACTOR_CALCULATION_CONFIG, BASE_DIRS, get_full_path
 
 logger = factor_calculation_logger
 
@@ -35,6 +35,10 @@ START_DATE = FACTOR_CALCULATION_CONFIG['START_DATE']
 END_DATE = FACTOR_CALCULATION_CONFIG['END_DATE']
 BATCH_SIZE = FACTOR_CALCULATION_CONFIG['BATCH_SIZE']
 RESULT_DIR = FACTOR_CALCULATION_CONFIG['RESULT_DIR']
+USE_PARQUET_CACHE = FACTOR_CALCULATION_CONFIG['USE_PARQUET_CACHE']
+
+# 行情数据缓存目录，未开启缓存时为None
+STOCK_DATA_CACHE_DIR = os.path.join(BASE_DIRS['TEMP'], 'cache') if USE_PARQUET_CACHE else None
 
 
 def get_all_factors():
@@ -104,7 +108,7 @@ def calculate_all_factors():
         
         # 加载股票数据
         logger.info("加载股票数据...")
-        stock_data = load_stock_data(conn)
+        stock_data = load_stock_data(conn, cache_dir=STOCK_DATA_CACHE_DIR)
         if stock_data is None or stock_data.empty:
             logger.error("没有加载到股票数据，程序退出")
             conn.close()
@@ -165,7 +169,7 @@ def calculate_selected_factors(factor_names=None):
         
         # 加载股票数据
         logger.info("加载股票数据...")
-        stock_data = load_stock_data(conn)
+        stock_data = load_stock_data(conn, cache_dir=STOCK_DATA_CACHE_DIR)
         if stock_data is None or stock_data.empty:
             logger.error("没有加载到股票数据，程序退出")
             conn.close()
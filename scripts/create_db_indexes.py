@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+数据库索引维护脚本
+
+为因子分析的查询创建索引（已存在时跳过）。因子分析器只读取数据库，不再自动建立索引，
+行情数据更新或数据库重建后手动运行一次即可。
+"""
+
+import os
+import sys
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from factor_lib import get_database_connection
+from config.logger_config import system_logger as logger
+
+# (索引名称, 表名, 索引列)
+ANALYSIS_INDEXES = [
+    # 按因子名称和日期范围加载因子数据（与Factor._create_table创建的索引相同）
+    ('idx_factors_name_date', 'factors', '(factor_name, trade_date)'),
+    # 按股票和日期计算远期收益率的LEAD窗口查询，覆盖收盘价后无需回表
+    ('idx_daily_quotes_code_date', 'daily_quotes', '(ts_code, trade_date, close)'),
+]
+
+
+def create_indexes(conn):
+    """
+    创建因子分析所需的索引
+
+    参数:
+        conn: 数据库连接对象
+
+    返回:
+        bool: 是否全部创建成功
+    """
+    success = True
+    for index_name, table_name, columns in ANALYSIS_INDEXES:
+        try:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} {columns}")
+            conn.commit()
+            logger.info(f"索引已就绪: {index_name}")
+        except Exception as e:
+            logger.error(f"创建索引 {index_name} 失败: {str(e)}")
+            success = False
+    return success
+
+
+def main():
+    """
+    主函数
+    """
+    conn = get_database_connection()
+    if conn is None:
+        logger.error("无法连接数据库，程序退出")
+        sys.exit(1)
+
+    try:
+        success = create_indexes(conn)
+    finally:
+        conn.close()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == '__main__':
+    main()
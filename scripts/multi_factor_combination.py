@@ -25,11 +25,17 @@ from scipy.optimize import minimize
 from tqdm import tqdm
 import numpy as np
 
+# pyarrow为可选依赖，未安装时分组收益数据保存为CSV
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
 # 添加项目根目录到Python路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # 导入配置和工具
-from config.config import FACTOR_ANALYSIS_CONFIG, PLOT_CONFIG, MULTI_FACTOR_COMBINATION_CONFIG
+from config.config import FACTOR_ANALYSIS_CONFIG, PLOT_CONFIG, MULTI_FACTOR_COMBINATION_CONFIG, set_run_timestamp
 from config.logger_config import get_logger
 from utils.file_manager import save_file
 from factor_lib.utils import get_database_connection, load_stock_data
@@ -94,6 +100,9 @@ class MultiFactorCombination:
             self.factor_analyzer = FactorAnalyzer(self.conn)
             self.factor_analyzer.set_test_scope(self.test_scope)
             
+            # 一次查询批量加载所有因子的原始数据，之后逐个因子的load_factor_data直接复用，不再逐个查询数据库
+            self.factor_analyzer.preload_factor_data(self.factors_list, self.start_date, self.end_date)
+            
             # 加载所有因子数据
             factor_data_list = []
             for factor_name in tqdm(self.factors_list, desc="加载因子数据", unit="因子", ascii=True, ncols=100, dynamic_ncols=False):
@@ -121,10 +130,11 @@ class MultiFactorCombination:
                 logger.error("没有加载到任何因子数据")
                 return False
             
-            self.factor_data = factor_data_list[0]
-            for i in range(1, len(factor_data_list)):
-                self.factor_data = pd.merge(self.factor_data, factor_data_list[i], 
-                                          on=['code', 'date'], how='inner')
+            # 按(code, date)索引一次内连接拼接所有因子，不再逐个因子两两合并
+            self.factor_data = pd.concat(
+                [factor_data.set_index(['code', 'date']) for factor_data in factor_data_list],
+                axis=1, join='inner'
+            ).reset_index()
             
             logger.info(f"因子数据加载完成，共 {len(self.factor_data)} 条记录")
             
@@ -157,10 +167,11 @@ class MultiFactorCombination:
             
             logger.info(f"数据合并完成，共 {len(self.data)} 条有效记录")
             
-            # 检查是否有缺失值
-            missing_values = self.data.isnull().sum()
-            if missing_values.sum() > 0:
-                logger.warning(f"数据中存在缺失值: {missing_values.to_dict()}")
+            # 检查是否有缺失值：因子和收益率列转换为一个float64数组，一次遍历统计各列缺失值数量
+            value_columns = [col for col in self.data.columns if col not in ('code', 'date')]
+            missing_counts = np.isnan(self.data[value_columns].to_numpy(dtype=np.float64)).sum(axis=0)
+            if missing_counts.any() or self.data[['code', 'date']].isnull().values.any():
+                logger.warning(f"数据中存在缺失值: {dict(zip(value_columns, missing_counts.tolist()))}")
                 # 删除包含缺失值的行
                 self.data = self.data.dropna()
                 logger.info(f"删除缺失值后，剩余 {len(self.data)} 条记录")
@@ -499,6 +510,9 @@ def main():
     """
     logger.info("========== 多因子组合分析开始 ==========")
     
+    # 本次运行保存的报告、图表和分组收益数据使用同一时间戳
+    set_run_timestamp()
+    
     # 从配置文件读取参数
     factors_list = MULTI_FACTOR_COMBINATION_CONFIG['FACTORS_LIST']
     start_date = MULTI_FACTOR_COMBINATION_CONFIG['START_DATE']
@@ -570,7 +584,10 @@ def main():
     
     # 保存分组收益数据
     if multi_factor.group_returns is not None:
-        group_returns_path = save_file(multi_factor.group_returns, 'factor_report', 'group_returns_data', with_datetime=True, format='csv')
+        group_returns_format = MULTI_FACTOR_COMBINATION_CONFIG.get('GROUP_RETURNS_FORMAT', 'csv')
+        if group_returns_format == 'parquet' and pyarrow is None:
+            group_returns_format = 'csv'
+        group_returns_path = save_file(multi_factor.group_returns, 'factor_report', 'group_returns_data', with_datetime=True, format=group_returns_format)
         logger.info(f"分组收益数据已保存至: {group_returns_path}")
     
     # 打印结果摘要
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试运行时间戳：主进程和工作进程获取到同一个时间戳，不同运行使用不同时间戳
+"""
+
+import os
+import sys
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import BASE_DIRS, RUN_TIMESTAMP_ENV, get_full_path, get_run_timestamp, set_run_timestamp
+
+
+def test_worker_shares_run_timestamp():
+    saved_timestamp = os.environ.pop(RUN_TIMESTAMP_ENV, None)
+    try:
+        # 运行入口未设置时间戳时读取当前时间，不写入环境变量
+        get_run_timestamp()
+        assert RUN_TIMESTAMP_ENV not in os.environ
+
+        timestamp = set_run_timestamp()
+        assert get_run_timestamp() == timestamp
+        assert get_full_path(BASE_DIRS['TEMP'], with_datetime=True).endswith(timestamp)
+
+        # spawn方式启动的工作进程重新导入模块，只能通过环境变量得到主进程的时间戳
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+            worker_timestamp = executor.submit(get_run_timestamp).result()
+        assert worker_timestamp == timestamp
+
+        # 同一进程中的下一次运行重新设置时间戳（时间戳精确到秒）
+        time.sleep(1)
+        assert set_run_timestamp() != timestamp
+    finally:
+        if saved_timestamp is None:
+            os.environ.pop(RUN_TIMESTAMP_ENV, None)
+        else:
+            os.environ[RUN_TIMESTAMP_ENV] = saved_timestamp
+
+
+if __name__ == "__main__":
+    test_worker_shares_run_timestamp()
+    print("运行时间戳共享测试通过！")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试并行分析时工作进程直接复用主进程共享的收益率数据，不再查询数据库
+"""
+
+import os
+import sys
+import sqlite3
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import analyzer.factor_analyzer as factor_analyzer
+from analyzer.factor_analyzer import FactorAnalyzer, _share_return_data, _init_factor_worker
+from config.logger_config import start_queue_listener, stop_queue_listener
+
+START_DATE = '2020-01-01'
+END_DATE = '2020-03-31'
+FORWARD_PERIOD = 5
+
+
+def create_test_database(db_path):
+    """创建包含行情和因子数据的测试数据库"""
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range(START_DATE, periods=80).strftime('%Y-%m-%d')
+    codes = [f'{600000 + i}.SH' for i in range(20)]
+
+    quotes = pd.DataFrame([(code, date) for code in codes for date in dates], columns=['ts_code', 'trade_date'])
+    quotes['close'] = 10 * np.exp(rng.normal(0, 0.02, len(quotes)).cumsum())
+    factors = quotes[['ts_code', 'trade_date']].assign(factor_name='test_factor',
+                                                       factor_value=rng.normal(size=len(quotes)))
+
+    conn = sqlite3.connect(db_path)
+    quotes.to_sql('daily_quotes', conn, index=False)
+    factors.to_sql('factors', conn, index=False)
+    conn.close()
+
+
+def _analyze_in_worker(factor_name):
+    """在工作进程中记录分析因子时执行的SQL语句"""
+    statements = []
+    analyzer = factor_analyzer._worker_analyzer
+    analyzer.conn.set_trace_callback(statements.append)
+    result = analyzer.analyze_factor(factor_name, forward_period=FORWARD_PERIOD,
+                                     start_date=START_DATE, end_date=END_DATE)
+    return result is not None, len(analyzer.return_data), statements
+
+
+def test_worker_uses_shared_return_data():
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # 分析器在当前目录下创建图表目录，测试在临时目录中运行
+        os.chdir(tmp_dir)
+        db_path = os.path.join(tmp_dir, 'test.db')
+        create_test_database(db_path)
+
+        # 与main()相同：主进程按analyze_factor使用的结束日期加载收益率数据
+        analyzer = FactorAnalyzer(sqlite3.connect(db_path))
+        return_end_date = analyzer.get_return_end_date(END_DATE, FORWARD_PERIOD)
+        assert analyzer.load_return_data(START_DATE, return_end_date, FORWARD_PERIOD)
+        shared_return_data = _share_return_data(analyzer.return_data)
+        if factor_analyzer.feather is not None:
+            # 安装pyarrow时通过内存映射的Arrow文件共享
+            assert isinstance(shared_return_data, str)
+
+        log_queue, log_listener = start_queue_listener(factor_analyzer.logger)
+        try:
+            with ProcessPoolExecutor(max_workers=2, initializer=_init_factor_worker,
+                                     initargs=(db_path, analyzer.test_scope, analyzer.individual_stock,
+                                               shared_return_data, analyzer._return_data_key,
+                                               log_queue)) as executor:
+                worker_results = list(executor.map(_analyze_in_worker, ['test_factor'] * 2))
+        finally:
+            stop_queue_listener(log_listener)
+            if isinstance(shared_return_data, str) and os.path.exists(shared_return_data):
+                os.remove(shared_return_data)
+            os.chdir(cwd)
+
+        for analyzed, return_count, statements in worker_results:
+            assert analyzed
+            assert return_count == len(analyzer.return_data)
+            # 收益率由LEAD窗口函数在数据库中计算，工作进程中不应出现该查询
+            assert not any('LEAD(close' in statement for statement in statements)
+        analyzer.conn.close()
+
+
+if __name__ == "__main__":
+    test_worker_uses_shared_return_data()
+    print("工作进程复用共享收益率数据测试通过！")
@@ -10,7 +10,6 @@ import os
 import sys
 import json
 import pandas as pd
-from datetime import datetime
 
 # 添加项目根目录到Python路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -18,7 +17,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 # 导入配置
 from config.config import (
     REPORTS_DIRS, FACTOR_RESULTS_DIRS, BACKTEST_RESULTS_DIRS,
-    get_full_path, create_all_directories
+    get_full_path, create_all_directories, ensure_directory, get_run_timestamp
 )
 
 class FileManager:
@@ -40,7 +39,7 @@ class FileManager:
             file_type (str): 文件类型，决定保存的目录
             file_name (str): 文件名（不含扩展名）
             with_datetime (bool): 是否在文件名中包含日期时间，默认False
-            **kwargs: 其他参数，如格式等
+            **kwargs: 其他参数，如格式等（DataFrame指定format='parquet'时保存为zstd压缩的Parquet文件）
             
         返回:
             str: 保存的文件路径
@@ -71,11 +70,12 @@ class FileManager:
         save_dir = dir_map[file_type]
         
         # 创建目录（如果不存在）
-        os.makedirs(save_dir, exist_ok=True)
+        ensure_directory(save_dir)
         
         # 处理文件名
         if with_datetime:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            # 本次运行的所有文件使用同一时间戳
+            timestamp = get_run_timestamp()
             full_file_name = f"{file_name}_{timestamp}{self._get_extension(content, kwargs.get('format'))}"
         else:
             full_file_name = f"{file_name}{self._get_extension(content, kwargs.get('format'))}"
@@ -121,8 +121,12 @@ class FileManager:
             **kwargs: 其他参数
         """
         if isinstance(content, pd.DataFrame):
-            # 保存为CSV
-            content.to_csv(file_path, index=kwargs.get('index', True), encoding='utf-8')
+            if file_path.endswith('.parquet'):
+                # 保存为列式存储的Parquet，数值以二进制写入，无需格式化为字符串
+                content.to_parquet(file_path, index=kwargs.get('index', True), compression='zstd')
+            else:
+                # 保存为CSV
+                content.to_csv(file_path, index=kwargs.get('index', True), encoding='utf-8')
         elif isinstance(content, dict) or isinstance(content, list):
             # 保存为JSON
             with open(file_path, 'w', encoding='utf-8') as f: